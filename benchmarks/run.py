@@ -0,0 +1,182 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from benchmarks.synthetic import synthetic_ohlcv
+from realized_vol.vol_engine import RealizedVolEngine
+from realized_vol.panel_engine import PanelVolEngine
+from realized_vol.data_loader import MarketDataLoader
+from realized_vol.sources import LocalFileSource
+from realized_vol.frame_cache import FrameCache
+
+# (tickers, years); the full set adds the universe-scale panels
+QUICK_SIZES = [(1, 1), (1, 25), (10, 5), (100, 10)]
+FULL_SIZES = QUICK_SIZES + [(500, 25)]
+
+ESTIMATORS = ['compute_realized_vol', 'compute_parkinson_vol', 'compute_garman_klass_vol',
+              'compute_hodges_tompkins_vol', 'calculate_all_volatility_types']
+
+
+def time_call(func, repeats: int, setup=None) -> dict:
+    # setup runs before each repeat, outside the timed region
+    timings = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {'min_s': min(timings), 'median_s': statistics.median(timings), 'repeats': repeats}
+
+
+def bench_single_ticker(sizes, repeats):
+    for n_tickers, n_years in sizes:
+        if n_tickers != 1:
+            continue
+        prices = synthetic_ohlcv(1, n_years)
+        # A fresh engine per call, so cached log terms and price fields are not reused across repeats
+        for method in ESTIMATORS:
+            yield f"RealizedVolEngine.{method}", f"1x{n_years}y", time_call(
+                lambda: getattr(RealizedVolEngine(prices), method)(), repeats)
+
+
+def bench_panel(sizes, repeats):
+    for n_tickers, n_years in sizes:
+        prices = synthetic_ohlcv(n_tickers, n_years)
+        size = f"{n_tickers}x{n_years}y"
+        yield 'PanelVolEngine.calculate_all_volatility_types', size, time_call(
+            lambda: PanelVolEngine(prices).calculate_all_volatility_types(), repeats)
+        yield 'PanelVolEngine.compute_cube[5..60]', size, time_call(
+            lambda: PanelVolEngine(prices).compute_cube(list(range(5, 61, 5))), repeats)
+
+
+def bench_loader(sizes, repeats):
+    for n_tickers, n_years in sizes:
+        prices = synthetic_ohlcv(n_tickers, n_years)
+        tickers = tuple(prices.columns.get_level_values(1).unique())
+        start = prices.index[0].strftime('%Y-%m-%d')
+        end = (prices.index[-1] + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+        size = f"{n_tickers}x{n_years}y"
+
+        workdir = tempfile.mkdtemp(prefix='vol-bench-')
+        try:
+            source = LocalFileSource(os.path.join(workdir, 'source'))
+            source.save(prices)
+            cache_dir = os.path.join(workdir, 'cache')
+
+            yield 'MarketDataLoader.fetch_price_series[miss]', size, time_call(
+                lambda: MarketDataLoader(cache_dir=cache_dir, source=source).fetch_price_series(tickers, start, end),
+                repeats, setup=lambda: shutil.rmtree(cache_dir, ignore_errors=True))
+
+            loader = MarketDataLoader(cache_dir=cache_dir, source=source)
+            loader.fetch_price_series(tickers, start, end)
+            yield 'MarketDataLoader.fetch_price_series[hit]', size, time_call(
+                lambda: loader.fetch_price_series(tickers, start, end), repeats)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def bench_update_plots(sizes, repeats):
+    try:
+        import dashboard_interactive as dashboard
+    except ImportError as e:
+        print(f"Skipping update_plots benchmarks: {e}", file=sys.stderr)
+        return
+
+    # Keep benchmark frames out of the user's caches
+    workdir = tempfile.mkdtemp(prefix='vol-bench-')
+    dashboard.loader = MarketDataLoader(cache_dir=os.path.join(workdir, 'prices'))
+    dashboard.frame_cache = FrameCache(cache_dir=os.path.join(workdir, 'frames'))
+    try:
+        for n_tickers, n_years in sizes:
+            if n_tickers > 100:
+                continue
+            prices = synthetic_ohlcv(n_tickers, n_years)
+            tickers = list(prices.columns.get_level_values(1).unique())
+            data = {'handle': dashboard.frame_cache.put(prices), 'tickers': tickers, 'start': None, 'end': None}
+            selected = ['Realized VOL', 'Parkinson VOL']
+            size = f"{n_tickers}x{n_years}y"
+
+            yield 'update_plots[cold]', size, time_call(lambda: dashboard.update_plots(data, selected, 21, 2.5),
+                                                        repeats, setup=dashboard.result_cache.clear)
+            yield 'update_plots[warm]', size, time_call(lambda: dashboard.update_plots(data, selected, 21, 2.5), repeats)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+SUITES = {
+    'engine': bench_single_ticker,
+    'panel': bench_panel,
+    'loader': bench_loader,
+    'dashboard': bench_update_plots,
+}
+
+
+def compare(results: list, baseline_path: str, tolerance: float) -> list:
+    with open(baseline_path) as f:
+        baseline = {(r['name'], r['size']): r for r in json.load(f)['results']}
+
+    slowdowns = []
+    for result in results:
+        previous = baseline.get((result['name'], result['size']))
+        if previous is None:
+            continue
+        ratio = result['median_s'] / previous['median_s'] if previous['median_s'] else float('inf')
+        result['baseline_median_s'] = previous['median_s']
+        result['ratio'] = ratio
+        if ratio > 1 + tolerance:
+            slowdowns.append(result)
+    return slowdowns
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the volatility engine, loader and dashboard callbacks.")
+    parser.add_argument('--full', action='store_true', help="Include the 500 tickers x 25 years panel")
+    parser.add_argument('--suites', default=','.join(SUITES), help=f"Comma-separated subset of {list(SUITES)}")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', default=None, help="Baseline JSON from an earlier run")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed fractional slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    sizes = FULL_SIZES if args.full else QUICK_SIZES
+    results = []
+    for suite in args.suites.split(','):
+        for name, size, timing in SUITES[suite.strip()](sizes, args.repeats):
+            results.append({'name': name, 'size': size, **timing})
+            print(f"{name:<50} {size:>10} median {timing['median_s'] * 1e3:10.2f} ms  min {timing['min_s'] * 1e3:10.2f} ms")
+
+    slowdowns = compare(results, args.compare, args.tolerance) if args.compare else []
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if slowdowns:
+        print(f"\n{len(slowdowns)} benchmarks slower than baseline by more than {args.tolerance:.0%}:")
+        for result in slowdowns:
+            print(f"  {result['name']} [{result['size']}]: {result['baseline_median_s'] * 1e3:.2f} ms -> "
+                  f"{result['median_s'] * 1e3:.2f} ms ({result['ratio']:.2f}x)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+from realized_vol.config import TRADING_DAYS_PER_YEAR
+
+
+def synthetic_ohlcv(n_tickers: int = 1, n_years: float = 1, seed: int = 0, start: str = '2000-01-03') -> pd.DataFrame:
+    # Deterministic GBM closes with an overnight gap into the open and high/low excursions that
+    # scale with each ticker's intraday vol, laid out like yf.download's (Price, Ticker) frame
+    rng = np.random.default_rng(seed)
+    n_days = int(round(n_years * TRADING_DAYS_PER_YEAR))
+    index = pd.bdate_range(start, periods=n_days, name='Date')
+    tickers = [f"SYN{i:04d}" for i in range(n_tickers)]
+
+    annual_vol = rng.uniform(0.15, 0.6, n_tickers)
+    daily_vol = annual_vol / np.sqrt(TRADING_DAYS_PER_YEAR)
+    drift = rng.uniform(-0.05, 0.15, n_tickers) / TRADING_DAYS_PER_YEAR
+
+    overnight = rng.normal(0.0, 0.35, (n_days, n_tickers)) * daily_vol
+    intraday = rng.normal(0.0, 0.9, (n_days, n_tickers)) * daily_vol + drift - 0.5 * daily_vol ** 2
+
+    log_close = np.log(rng.uniform(20, 500, n_tickers)) + np.cumsum(overnight + intraday, axis=0)
+    close = np.exp(log_close)
+    open_ = np.exp(log_close - intraday)
+
+    # Excursions beyond the open/close body, roughly the size of a Brownian range
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0.0, 0.5, (n_days, n_tickers))) * daily_vol)
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0.0, 0.5, (n_days, n_tickers))) * daily_vol)
+    volume = np.round(rng.lognormal(14, 0.5, (n_days, n_tickers)))
+
+    fields = {'Close': close, 'High': high, 'Low': low, 'Open': open_, 'Volume': volume}
+    columns = pd.MultiIndex.from_product([list(fields), tickers], names=['Price', 'Ticker'])
+    return pd.DataFrame(np.hstack(list(fields.values())), index=index, columns=columns)
@@ -1,19 +1,46 @@
 import dash
-from dash import dcc, html, Input, Output, State, callback_context
+from dash import dcc, html, Input, Output, State, MATCH, callback_context
 import plotly.graph_objs as go
 import pandas as pd
 from realized_vol.data_loader import MarketDataLoader
-from realized_vol.vol_engine import RealizedVolEngine
-from utils import detect_spikes
+from realized_vol.frame_cache import FrameCache
+from realized_vol.result_cache import VolResultCache
+from realized_vol.config import OPTION_CHAIN_DIR, RISK_FREE_RATE, PREFETCH_ENABLED
+from realized_vol.prefetch import PrefetchScheduler
+from realized_vol.price_panel import fields_for
+from realized_vol import metrics
+from implied_vol.chain_source import OptionChainSource
+from implied_vol.surface import VolSurface
+from utils import detect_spikes, downsample_indices
 import dash_bootstrap_components as dbc
 from datetime import datetime, timedelta
 import traceback
-from io import StringIO
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.LUX])
 server = app.server
+# GET /metrics, plus per-request profiles when VOL_PROFILE_DIR is set
+metrics.install(server)
 
 loader = MarketDataLoader()
+frame_cache = FrameCache()
+result_cache = VolResultCache()
+chain_source = OptionChainSource(OPTION_CHAIN_DIR)
+# (stored handle, fields) -> handle of the same request re-read with more fields
+widened_handles = {}
+# One surface per underlying, refreshed slice by slice when its chain file changes
+surfaces = {}
+surface_mtimes = {}
+
+# Slider stops; every one is computed on the first load so moving the slider is a cache lookup
+VOL_WINDOWS = list(range(5, 61, 5))
+# Refreshes the watch-list and recent requests off the request path; started on the first request
+prefetcher = PrefetchScheduler(loader, frame_cache, result_cache, cone_windows=VOL_WINDOWS)
+if PREFETCH_ENABLED:
+    server.before_request(prefetcher.start)
+
+# Points kept per trace after LTTB downsampling, and the figure size that switches traces to WebGL
+PLOT_MAX_POINTS = 2000
+WEBGL_POINT_THRESHOLD = 5000
 
 default_end = datetime.now()
 default_start = default_end - timedelta(days=3*365)
@@ -69,7 +96,7 @@ app.layout = dbc.Container([
                         max=60,
                         step=5,
                         value=21,
-                        marks={i: str(i) for i in range(5, 61, 5)},
+                        marks={i: str(i) for i in VOL_WINDOWS},
                         className="mb-3"
                     ),
                     
@@ -105,11 +132,21 @@ app.layout = dbc.Container([
         ], md=3),
         
         dbc.Col([
-            dbc.Spinner(
-                html.Div(id='plots-container'),
-                color="primary",
-                spinner_style={"width": "3rem", "height": "3rem"}
-            ),
+            dbc.Tabs([
+                dbc.Tab(
+                    dbc.Spinner(
+                        html.Div(id='plots-container'),
+                        color="primary",
+                        spinner_style={"width": "3rem", "height": "3rem"}
+                    ),
+                    label="Realized VOL",
+                    tab_id='realized-tab'
+                ),
+                dbc.Tab([
+                    dcc.Dropdown(id='surface-underlying', placeholder='Underlying', className="my-3"),
+                    dcc.Graph(id='surface-heatmap')
+                ], label="IV Surface", tab_id='surface-tab'),
+            ], id='main-tabs', active_tab='realized-tab'),
             dcc.Store(id='data-store')  
         ], md=9)
     ]),
@@ -131,21 +168,178 @@ app.layout = dbc.Container([
      Input('interval-component', 'n_intervals')],
     [State('ticker-input', 'value'),
      State('start-date', 'date'),
-     State('end-date', 'date')]
+     State('end-date', 'date'),
+     State('vol-types', 'value'),
+     State('data-store', 'data')]
 )
-def load_and_store_data(n_clicks, n_intervals, tickers, start_date, end_date):
+@metrics.timed('callback.load_and_store_data')
+def load_and_store_data(n_clicks, n_intervals, tickers, start_date, end_date, selected_vols, current):
     if not tickers:
         return dash.no_update
     
     tickers = [ticker.strip().upper() for ticker in tickers.split(',')]
     loader.set_tickers(tickers)
+    # Close for the price axis plus whatever the selected estimators read
+    fields = fields_for(selected_vols or [], extra=('Close',))
     
     try:
-        df = loader.fetch_price_series(tuple(tickers), start_date, end_date)
-        return df.to_json(date_format='iso', orient='split')
+        # Warm requests come straight from the prefetcher; cold ones are fetched once per key
+        handle = prefetcher.get(tickers, start_date, end_date, fields)
+        if current and current.get('handle') == handle:
+            return dash.no_update
+        # Only the handle and the request travel to the browser; the frame stays server-side
+        return {'handle': handle, 'tickers': tickers, 'start': start_date, 'end': end_date, 'fields': list(fields)}
     except Exception as e:
         return dash.no_update
 
+def load_stored_frame(data: dict, selected_vols: list = ()):
+    fields = fields_for(selected_vols or [], extra=('Close', *data.get('fields', ())))
+    # A frame widened for a newly selected estimator is reused until the store is next reloaded
+    handle = widened_handles.get((data['handle'], fields), data['handle'])
+    df = frame_cache.get(handle)
+    if df is None or not set(fields) <= set(df.columns.get_level_values(0)):
+        # Evicted, written by another host, or short of a newly selected estimator's fields:
+        # rebuild from the (warm) price store
+        df = loader.fetch_price_series(tuple(data['tickers']), data['start'], data['end'], fields=fields)
+        handle = frame_cache.put(df)
+        if handle != data['handle']:
+            if len(widened_handles) >= 256:
+                widened_handles.clear()
+            widened_handles[(data['handle'], fields)] = handle
+    return handle, df
+
+def build_cone_figure(ticker: str, vol_type: str, cone: pd.DataFrame, window: int) -> go.Figure:
+    windows = cone.index
+    bands = [('0%', '100%', 'rgba(52, 152, 219, 0.15)'), ('10%', '90%', 'rgba(52, 152, 219, 0.25)'),
+             ('25%', '75%', 'rgba(52, 152, 219, 0.35)')]
+    traces = []
+    for low, high, color in bands:
+        traces.append(go.Scatter(x=windows, y=cone[high], mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+        traces.append(go.Scatter(x=windows, y=cone[low], mode='lines', line=dict(width=0), fill='tonexty',
+                                 fillcolor=color, name=f"{low}-{high}", hoverinfo='skip'))
+    traces.append(go.Scatter(x=windows, y=cone['50%'], name='Median', line=dict(color='#2c3e50', dash='dash')))
+    traces.append(go.Scatter(x=windows, y=cone['Latest'], name='Latest', mode='lines+markers',
+                             line=dict(color='#e74c3c')))
+
+    fig = go.Figure(
+        data=traces,
+        layout=go.Layout(
+            title=f'{ticker} {vol_type} Cone',
+            xaxis=dict(title='Window (days)'),
+            yaxis=dict(title='Volatility'),
+            height=320,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+    )
+    fig.add_vline(x=window, line=dict(color='#95a5a6', dash='dot'))
+    return fig
+
+VOL_COLORS = {
+    'Realized VOL': '#e74c3c',
+    'Parkinson VOL': '#3498db',
+    'Garman-Klass VOL': '#2ecc71',
+    'Hodges-Tompkins VOL': '#9b59b6'
+}
+
+def build_vol_figure(ticker: str, price_data: pd.Series, vols: pd.DataFrame, selected_vols: list,
+                     x_range: tuple = None, threshold: float = None) -> go.Figure:
+    series = [('Price', price_data)] + [(vol_type, vols[vol_type]) for vol_type in selected_vols if vol_type in vols.columns]
+    
+    # Downsample each series server-side; switch to WebGL once the figure is still large
+    sampled = []
+    for name, values in series:
+        keep = downsample_indices(values.index, values.to_numpy(), PLOT_MAX_POINTS, x_range)
+        sampled.append((name, values.iloc[keep]))
+    n_points = sum(len(values) for _, values in sampled)
+    trace_type = go.Scattergl if n_points > WEBGL_POINT_THRESHOLD else go.Scatter
+    
+    # Create price trace
+    _, price_sampled = sampled[0]
+    traces = [
+        trace_type(
+            x=price_sampled.index,
+            y=price_sampled,
+            name=f"{ticker} Price",
+            yaxis='y2',
+            line=dict(color='#2c3e50', width=1.5),
+            opacity=0.8,
+            hovertemplate="Price: %{y:.2f}<extra></extra>"
+        )
+    ]
+    
+    # Add volatility traces
+    for vol_type, values in sampled[1:]:
+        traces.append(trace_type(
+            x=values.index,
+            y=values,
+            name=f"{ticker} {vol_type}",
+            line=dict(color=VOL_COLORS.get(vol_type, '#34495e'), width=2),
+            opacity=0.9,
+            hovertemplate=f"{vol_type}: %{{y:.2f}}<extra></extra>"
+        ))
+    
+    xaxis = dict(
+        rangeslider=dict(visible=True),
+        type='date'
+    )
+    if x_range is not None:
+        xaxis['range'] = list(x_range)
+    
+    # Spike labels come from the full-resolution series, not the downsampled trace
+    annotations = []
+    if threshold is not None and len(series) > 1:
+        annotations = detect_spikes(series[1][1], threshold)
+    
+    # Create figure
+    fig = go.Figure(
+        data=traces,
+        layout=go.Layout(
+            title=f'{ticker} Volatility Analysis',
+            xaxis=xaxis,
+            yaxis=dict(title='Volatility'),
+            yaxis2=dict(
+                title='Price',
+                overlaying='y',
+                side='right',
+                showgrid=False
+            ),
+            hovermode='x unified',
+            uirevision=ticker,
+            annotations=annotations,
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            )
+        )
+    )
+    
+    # Add time range buttons
+    fig.update_xaxes(
+        rangeselector=dict(
+            buttons=list([
+                dict(count=1, label="1m", step="month", stepmode="backward"),
+                dict(count=6, label="6m", step="month", stepmode="backward"),
+                dict(count=1, label="YTD", step="year", stepmode="todate"),
+                dict(count=1, label="1y", step="year", stepmode="backward"),
+                dict(step="all")
+            ])
+        )
+    )
+    return fig
+
+def relayout_x_range(relayout_data: dict):
+    if not relayout_data or relayout_data.get('xaxis.autorange'):
+        return None
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'])
+    return dash.no_update
+
 @app.callback(
     Output('plots-container', 'children'),
     [Input('data-store', 'data'),
@@ -153,124 +347,34 @@ def load_and_store_data(n_clicks, n_intervals, tickers, start_date, end_date):
      Input('vol-window', 'value'),
      Input('spike-threshold', 'value')]
 )
-def update_plots(json_data, selected_vols, window, threshold):
-    if json_data is None:
+@metrics.timed('callback.update_plots')
+def update_plots(data, selected_vols, window, threshold):
+    if data is None:
         return dbc.Alert("Please enter tickers and click 'Load Data'", color="info")
     
     try:
-        # Read JSON data with StringIO
-        df = pd.read_json(StringIO(json_data), orient='split')
+        handle, df = load_stored_frame(data, selected_vols)
+        closes = df['Close']
+        selected_vols = selected_vols or []
         
-        print("\nRaw DataFrame Structure:")
-        print("Columns:", df.columns)
-        print("Shape:", df.shape)
+        # Only the selected estimators are computed, and only on a cache miss
+        all_vols = result_cache.get_volatilities(handle, df, window, selected_vols, cone_windows=VOL_WINDOWS)
         
-        # Extract unique tickers from the MultiIndex columns
-        if isinstance(df.columns, pd.MultiIndex):
-            tickers = list(df.columns.levels[1].unique())
-        else:
-            # Handle case where columns are tuples but not proper MultiIndex
-            tickers = list(set(col[1] for col in df.columns if isinstance(col, tuple)))
-        
-        print(f"\nProcessing {len(tickers)} tickers:", tickers)
+        print(f"\nProcessing {len(all_vols)} tickers:", list(all_vols))
         
         graphs = []
         
-        for ticker in tickers:
+        for ticker, vols in all_vols.items():
             try:
-                print(f"\nProcessing ticker: {ticker}")
-                
-                # Select columns for this ticker - works for both MultiIndex and tuple columns
-                col_mask = [col[1] == ticker for col in df.columns]
-                prices = df.loc[:, col_mask].copy()
-                
-                # Rename columns to remove ticker suffix
-                prices.columns = [col[0] for col in prices.columns]
-                print("Prices columns after selection:", prices.columns)
-                
-                # Get close prices
-                price_data = prices['Close']
-                print("Price data sample:", price_data.head(2))
-                
-                # Calculate volatilities
-                engine = RealizedVolEngine(prices, window=window)
-                vols = engine.calculate_all_volatility_types()
-                print("Volatilities calculated:", list(vols.columns))
-                
-                # Create price trace
-                traces = [
-                    go.Scatter(
-                        x=vols.index,
-                        y=price_data,
-                        name=f"{ticker} Price",
-                        yaxis='y2',
-                        line=dict(color='#2c3e50', width=1.5),
-                        opacity=0.8,
-                        hovertemplate="Price: %{y:.2f}<extra></extra>"
-                    )
-                ]
-                
-                # Add volatility traces
-                vol_colors = {
-                    'Realized VOL': '#e74c3c',
-                    'Parkinson VOL': '#3498db',
-                    'Garman-Klass VOL': '#2ecc71',
-                    'Hodges-Tompkins VOL': '#9b59b6'
-                }
-                
-                for vol_type in selected_vols:
-                    if vol_type in vols.columns:
-                        traces.append(go.Scatter(
-                            x=vols.index,
-                            y=vols[vol_type],
-                            name=f"{ticker} {vol_type}",
-                            line=dict(color=vol_colors.get(vol_type, '#34495e'), width=2),
-                            opacity=0.9,
-                            hovertemplate=f"{vol_type}: %{{y:.2f}}<extra></extra>"
-                        ))
-                
-                # Create figure
-                fig = go.Figure(
-                    data=traces,
-                    layout=go.Layout(
-                        title=f'{ticker} Volatility Analysis',
-                        xaxis=dict(
-                            rangeslider=dict(visible=True),
-                            type='date'
-                        ),
-                        yaxis=dict(title='Volatility'),
-                        yaxis2=dict(
-                            title='Price',
-                            overlaying='y',
-                            side='right',
-                            showgrid=False
-                        ),
-                        hovermode='x unified',
-                        legend=dict(
-                            orientation="h",
-                            yanchor="bottom",
-                            y=1.02,
-                            xanchor="right",
-                            x=1
-                        )
-                    )
-                )
-                
-                # Add time range buttons
-                fig.update_xaxes(
-                    rangeselector=dict(
-                        buttons=list([
-                            dict(count=1, label="1m", step="month", stepmode="backward"),
-                            dict(count=6, label="6m", step="month", stepmode="backward"),
-                            dict(count=1, label="YTD", step="year", stepmode="todate"),
-                            dict(count=1, label="1y", step="year", stepmode="backward"),
-                            dict(step="all")
-                        ])
-                    )
-                )
+                fig = build_vol_figure(ticker, closes[ticker], vols, selected_vols, threshold=threshold)
+                body = [dcc.Graph(id={'type': 'vol-graph', 'ticker': ticker}, figure=fig)]
+                if selected_vols:
+                    cone = result_cache.get_cone(handle, ticker, selected_vols[0])
+                    if cone is not None:
+                        body.append(dcc.Graph(figure=build_cone_figure(ticker, selected_vols[0], cone, window)))
                 
                 graphs.append(dbc.Card(
-                    dbc.CardBody(dcc.Graph(figure=fig)),
+                    dbc.CardBody(body),
                     className="mb-4"
                 ))
                 
@@ -286,12 +390,102 @@ def update_plots(json_data, selected_vols, window, threshold):
         print(error_msg)
         return dbc.Alert(error_msg, color="danger")
 
+@app.callback(
+    Output({'type': 'vol-graph', 'ticker': MATCH}, 'figure'),
+    Input({'type': 'vol-graph', 'ticker': MATCH}, 'relayoutData'),
+    [State('data-store', 'data'),
+     State('vol-types', 'value'),
+     State('vol-window', 'value'),
+     State('spike-threshold', 'value')],
+    prevent_initial_call=True
+)
+@metrics.timed('callback.resample_on_zoom')
+def resample_on_zoom(relayout_data, data, selected_vols, window, threshold):
+    # Re-resolve the downsampled traces for the zoomed range from cached results
+    x_range = relayout_x_range(relayout_data)
+    if data is None or x_range is dash.no_update:
+        return dash.no_update
+    
+    ticker = callback_context.outputs_list['id']['ticker']
+    handle, df = load_stored_frame(data, selected_vols)
+    selected_vols = selected_vols or []
+    vols = result_cache.get_volatilities(handle, df, window, selected_vols, cone_windows=VOL_WINDOWS)
+    if ticker not in vols:
+        return dash.no_update
+    return build_vol_figure(ticker, df['Close'][ticker], vols[ticker], selected_vols, x_range, threshold)
+
+def load_surface(underlying: str) -> VolSurface:
+    # Re-reads a chain only when its file changes; the surface then refits just the expiries that moved
+    modified = chain_source.modified(underlying)
+    if modified is None:
+        return None
+    surface = surfaces.get(underlying)
+    if surface is None or surface_mtimes.get(underlying) != modified:
+        chain = chain_source.load(underlying)
+        latest = chain[chain['QuoteDate'] == chain['QuoteDate'].max()]
+        if surface is None:
+            surface = VolSurface(rate=RISK_FREE_RATE)
+        surface.drop_expired(latest['QuoteDate'].iloc[0])
+        surface.update(latest)
+        surfaces[underlying] = surface
+        surface_mtimes[underlying] = modified
+    return surface
+
+def build_surface_figure(underlying: str, grid: pd.DataFrame) -> go.Figure:
+    fig = go.Figure(
+        data=[go.Heatmap(
+            x=grid.columns,
+            y=[expiry.strftime('%Y-%m-%d') for expiry in grid.index],
+            z=grid.to_numpy(),
+            colorscale='Viridis',
+            colorbar=dict(title='IV'),
+            hovertemplate="k: %{x:.2f}<br>Expiry: %{y}<br>IV: %{z:.2%}<extra></extra>"
+        )],
+        layout=go.Layout(
+            title=f'{underlying} Implied Volatility Surface',
+            xaxis=dict(title='Log-moneyness ln(K/F)'),
+            yaxis=dict(title='Expiry', type='category'),
+            height=560
+        )
+    )
+    return fig
+
+@app.callback(
+    Output('surface-underlying', 'options'),
+    [Input('main-tabs', 'active_tab'),
+     Input('interval-component', 'n_intervals')]
+)
+@metrics.timed('callback.update_surface_options')
+def update_surface_options(active_tab, n_intervals):
+    if active_tab != 'surface-tab':
+        return dash.no_update
+    return [{'label': u, 'value': u} for u in chain_source.underlyings()]
+
+@app.callback(
+    Output('surface-heatmap', 'figure'),
+    [Input('surface-underlying', 'value'),
+     Input('interval-component', 'n_intervals')]
+)
+@metrics.timed('callback.update_surface')
+def update_surface(underlying, n_intervals):
+    if not underlying:
+        return go.Figure(layout=go.Layout(title=f"Select an underlying with a chain file in {OPTION_CHAIN_DIR}"))
+    try:
+        surface = load_surface(underlying)
+        if surface is None or not surface.expiries:
+            return go.Figure(layout=go.Layout(title=f"No usable option quotes for {underlying}"))
+        return build_surface_figure(underlying, surface.grid())
+    except Exception as e:
+        print(f"Surface error for {underlying}: {str(e)}")
+        return go.Figure(layout=go.Layout(title=f"Error building {underlying} surface: {str(e)}"))
+
 @app.callback(
     Output("sp500-modal", "is_open"),
     [Input("sp500-button", "n_clicks"), 
      Input("close-sp500-modal", "n_clicks")],
     [State("sp500-modal", "is_open")],
 )
+@metrics.timed('callback.toggle_sp500_modal')
 def toggle_sp500_modal(n1, n2, is_open):
     if n1 or n2:
         return not is_open
@@ -301,6 +495,7 @@ def toggle_sp500_modal(n1, n2, is_open):
     Output("sp500-modal-body", "children"),
     [Input("sp500-button", "n_clicks")]
 )
+@metrics.timed('callback.update_sp500_modal')
 def update_sp500_modal(n):
     if n is None:
         return dash.no_update
@@ -0,0 +1,35 @@
+import numpy as np
+from scipy.special import ndtr
+
+SQRT_2PI = np.sqrt(2.0 * np.pi)
+
+
+def norm_pdf(x):
+    return np.exp(-0.5 * x * x) / SQRT_2PI
+
+
+def d1_d2(spot, strike, expiry, rate, sigma, dividend=0.0):
+    sqrt_t = np.sqrt(expiry)
+    sigma_sqrt_t = sigma * sqrt_t
+    d1 = (np.log(spot / strike) + (rate - dividend + 0.5 * sigma * sigma) * expiry) / sigma_sqrt_t
+    return d1, d1 - sigma_sqrt_t
+
+
+def price(spot, strike, expiry, rate, sigma, is_call, dividend=0.0):
+    # Vectorised over any broadcastable inputs; is_call is a boolean array (False = put)
+    d1, d2 = d1_d2(spot, strike, expiry, rate, sigma, dividend)
+    forward_spot = spot * np.exp(-dividend * expiry)
+    discounted_strike = strike * np.exp(-rate * expiry)
+    call = forward_spot * ndtr(d1) - discounted_strike * ndtr(d2)
+    put = discounted_strike * ndtr(-d2) - forward_spot * ndtr(-d1)
+    return np.where(is_call, call, put)
+
+
+def vega(spot, strike, expiry, rate, sigma, dividend=0.0):
+    d1, _ = d1_d2(spot, strike, expiry, rate, sigma, dividend)
+    return spot * np.exp(-dividend * expiry) * norm_pdf(d1) * np.sqrt(expiry)
+
+
+def vomma(spot, strike, expiry, rate, sigma, dividend=0.0):
+    d1, d2 = d1_d2(spot, strike, expiry, rate, sigma, dividend)
+    return vega(spot, strike, expiry, rate, sigma, dividend) * d1 * d2 / sigma
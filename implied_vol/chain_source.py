@@ -0,0 +1,83 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+CHAIN_COLUMNS = ['QuoteDate', 'Expiry', 'Strike', 'Type', 'Bid', 'Ask', 'Last', 'Spot']
+DAYS_PER_YEAR = 365.0
+
+
+def normalize_chain(chain: pd.DataFrame, underlying: str = None) -> pd.DataFrame:
+    # One row per quote with a boolean IsCall, a Mid price and the year fraction T to expiry
+    missing = {'QuoteDate', 'Expiry', 'Strike', 'Type', 'Spot'} - set(chain.columns)
+    if missing:
+        raise ValueError(f"Option chain is missing columns: {sorted(missing)}")
+
+    chain = chain.copy()
+    if underlying is not None:
+        chain['Underlying'] = underlying
+    chain['QuoteDate'] = pd.to_datetime(chain['QuoteDate'])
+    chain['Expiry'] = pd.to_datetime(chain['Expiry'])
+    chain['IsCall'] = chain['Type'].astype(str).str.strip().str.upper().str[0] == 'C'
+
+    bid = chain['Bid'] if 'Bid' in chain else np.nan
+    ask = chain['Ask'] if 'Ask' in chain else np.nan
+    last = chain['Last'] if 'Last' in chain else np.nan
+    quoted = (bid > 0) & (ask >= bid)
+    chain['Mid'] = np.where(quoted, 0.5 * (bid + ask), last)
+    chain['T'] = (chain['Expiry'] - chain['QuoteDate']).dt.days / DAYS_PER_YEAR
+    return chain
+
+
+class OptionChainSource:
+    # Reads <UNDERLYING>.parquet or <UNDERLYING>.csv chain snapshots from a directory,
+    # one row per quote with the CHAIN_COLUMNS; several QuoteDates per file are fine
+    EXTENSIONS = ('.parquet', '.csv')
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, underlying: str) -> str:
+        for extension in self.EXTENSIONS:
+            path = os.path.join(self.directory, underlying + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def underlyings(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        names = set()
+        for name in os.listdir(self.directory):
+            stem, extension = os.path.splitext(name)
+            if extension in self.EXTENSIONS:
+                names.add(stem)
+        return sorted(names)
+
+    def modified(self, underlying: str) -> float:
+        path = self._path(underlying)
+        return os.path.getmtime(path) if path else None
+
+    def load(self, underlying: str) -> pd.DataFrame:
+        path = self._path(underlying)
+        if path is None:
+            return None
+        chain = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+        return normalize_chain(chain, underlying)
+
+    def load_many(self, underlyings: List[str] = None) -> Dict[str, pd.DataFrame]:
+        chains = {}
+        for underlying in underlyings or self.underlyings():
+            chain = self.load(underlying)
+            if chain is not None and not chain.empty:
+                chains[underlying] = chain
+        return chains
+
+    def save(self, underlying: str, chain: pd.DataFrame, extension: str = '.parquet'):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, underlying + extension)
+        columns = [col for col in chain.columns if col in CHAIN_COLUMNS or col in ('Rate', 'Dividend')]
+        if extension == '.parquet':
+            chain[columns].to_parquet(path, index=False)
+        else:
+            chain[columns].to_csv(path, index=False)
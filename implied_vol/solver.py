@@ -0,0 +1,85 @@
+import numpy as np
+from scipy.special import ndtr
+from implied_vol.black_scholes import norm_pdf, SQRT_2PI
+
+
+def _black(forward, strike, total_vol, is_call):
+    # Undiscounted Black price on the forward, with total_vol = sigma * sqrt(T)
+    d1 = np.log(forward / strike) / total_vol + 0.5 * total_vol
+    d2 = d1 - total_vol
+    call = forward * ndtr(d1) - strike * ndtr(d2)
+    put = strike * ndtr(-d2) - forward * ndtr(-d1)
+    return np.where(is_call, call, put), d1, d2
+
+
+def _initial_guess(forward, strike, call_price):
+    # Corrado-Miller: a closed-form rational approximation that is close near the money.
+    # Far from it the bracketed iteration below takes over, so a rough guess is fine.
+    half_moneyness = 0.5 * (forward - strike)
+    excess = call_price - half_moneyness
+    root = np.sqrt(np.maximum(excess * excess - (forward - strike) ** 2 / np.pi, 0.0))
+    return SQRT_2PI / (forward + strike) * (excess + root)
+
+
+def implied_volatility(option_price, spot, strike, expiry, rate=0.0, is_call=True, dividend=0.0,
+                       tol: float = 1e-10, max_iter: int = 50, max_vol: float = 10.0) -> np.ndarray:
+    # Inverts Black-Scholes for whole arrays at once; quotes outside the no-arbitrage
+    # bounds or that fail to converge come back as NaN
+    option_price, spot, strike, expiry, rate, is_call, dividend = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (option_price, spot, strike, expiry, rate, is_call, dividend)))
+    shape = option_price.shape
+    option_price, spot, strike, expiry, rate, dividend = (
+        x.ravel() for x in (option_price, spot, strike, expiry, rate, dividend))
+    is_call = is_call.ravel().astype(bool)
+
+    discount = np.exp(-rate * expiry)
+    forward = spot * np.exp((rate - dividend) * expiry)
+    undiscounted = option_price / discount
+
+    # Solve on the out-of-the-money side, where the price carries all the time value.
+    # Put-call parity moves in-the-money quotes across without losing precision.
+    otm_call = strike >= forward
+    parity = np.where(is_call, -1.0, 1.0) * (forward - strike)
+    target = np.where(is_call == otm_call, undiscounted, undiscounted + parity)
+    upper = np.where(otm_call, forward, strike)
+
+    iv = np.full(option_price.shape, np.nan)
+    valid = (expiry > 0) & (spot > 0) & (strike > 0) & (target > 0) & (target < upper)
+    idx = np.flatnonzero(valid)
+
+    forward, strike, target, otm_call = forward[idx], strike[idx], target[idx], otm_call[idx]
+    sqrt_t = np.sqrt(expiry[idx])
+    lo = np.zeros(len(idx))
+    hi = max_vol * sqrt_t
+    call_price = np.where(otm_call, target, target + forward - strike)
+    s = np.clip(_initial_guess(forward, strike, call_price), 1e-4 * sqrt_t, 0.5 * hi)
+
+    # Safeguarded Halley on total vol: each step keeps a bracket on the root and falls back
+    # to bisection when the step leaves it. Converged options drop out of the active set.
+    for _ in range(max_iter):
+        if not len(idx):
+            break
+        model, d1, d2 = _black(forward, strike, s, otm_call)
+        diff = model - target
+        vega = forward * norm_pdf(d1)
+
+        hi = np.where(diff > 0, s, hi)
+        lo = np.where(diff < 0, s, lo)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = diff / vega
+            denom = 1.0 - 0.5 * newton * d1 * d2 / s
+            step = np.where(denom > 0.5, newton / denom, newton)
+            proposed = s - step
+        inside = np.isfinite(proposed) & (proposed > lo) & (proposed < hi)
+        proposed = np.where(inside, proposed, 0.5 * (lo + hi))
+
+        done = (np.abs(diff) <= tol * target) | (np.abs(proposed - s) <= tol * s)
+        iv[idx[done]] = np.where(np.abs(diff[done]) <= tol * target[done], s[done], proposed[done]) / sqrt_t[done]
+
+        keep = ~done
+        idx, s = idx[keep], proposed[keep]
+        forward, strike, target, otm_call = forward[keep], strike[keep], target[keep], otm_call[keep]
+        sqrt_t, lo, hi = sqrt_t[keep], lo[keep], hi[keep]
+
+    return iv.reshape(shape)
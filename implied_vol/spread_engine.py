@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+from typing import Dict
+from realized_vol.panel_engine import PanelVolEngine
+from realized_vol import kernels
+from implied_vol.chain_source import DAYS_PER_YEAR
+from implied_vol.surface import VolSurface
+
+SNAPSHOT_COLUMNS = ['RV', 'IV', 'Spread', 'VRP', 'Ratio', 'ZScore']
+
+
+def _grow(values: np.ndarray, n_rows: int) -> np.ndarray:
+    if len(values) >= n_rows:
+        return values
+    fill = np.nan if values.dtype.kind == 'f' else 0
+    extra = np.full((n_rows - len(values),) + values.shape[1:], fill, dtype=values.dtype)
+    return np.concatenate([values, extra])
+
+
+def atm_term_panels(quotes: pd.DataFrame, tenors: tuple = (30,), rate: float = 0.0,
+                    dividend: float = 0.0) -> Dict[int, pd.DataFrame]:
+    # (QuoteDate x Underlying) ATM IV panel per constant-maturity tenor (in calendar days),
+    # read off one surface per chain snapshot
+    tenor_years = np.asarray(tenors, dtype=np.float64) / DAYS_PER_YEAR
+    rows = {}
+    for (underlying, quote_date), chain in quotes.groupby(['Underlying', 'QuoteDate'], sort=False):
+        surface = VolSurface.from_quotes(chain, rate=rate, dividend=dividend)
+        if surface.expiries:
+            rows[(quote_date, underlying)] = surface.atm_vol(tenor_years)
+
+    if not rows:
+        return {tenor: pd.DataFrame() for tenor in tenors}
+    stacked = pd.DataFrame.from_dict(rows, orient='index', columns=list(tenors))
+    stacked.index = pd.MultiIndex.from_tuples(stacked.index, names=['Date', 'Ticker'])
+    return {tenor: stacked[tenor].unstack('Ticker').sort_index() for tenor in tenors}
+
+
+# Realized and implied vol held on one shared (date x ticker) grid. Spread (IV - RV),
+# variance risk premium (IV^2 - RV^2), IV/RV and a z-score of the spread against its
+# prior `lookback` rows are computed for the whole universe at once. New data on either
+# side only recomputes rows from the earliest one it touched.
+class VolSpreadEngine:
+    def __init__(self, realized: pd.DataFrame, implied: pd.DataFrame, lookback: int = 252,
+                 min_periods: int = None):
+        self.lookback = lookback
+        # Implied quotes are often sparser than daily bars, so a partial baseline is allowed
+        self.min_periods = min_periods or max(lookback // 2, 2)
+
+        self.index = realized.index.union(implied.index)
+        self.tickers = list(dict.fromkeys([*realized.columns, *implied.columns]))
+        self._rv = self._aligned(realized)
+        self._iv = self._aligned(implied)
+        self._recompute(0)
+
+    @classmethod
+    def from_prices(cls, price_panel: pd.DataFrame, implied: pd.DataFrame, window: int = 21,
+                    vol_type: str = 'Realized VOL', **kwargs) -> 'VolSpreadEngine':
+        vols = PanelVolEngine(price_panel, window).compute_volatility(vol_type)
+        # The engine back-fills the warm-up rows; they are not real observations
+        vols.iloc[:window] = np.nan
+        return cls(vols, implied, **kwargs)
+
+    def _aligned(self, panel: pd.DataFrame) -> np.ndarray:
+        return panel.reindex(index=self.index, columns=self.tickers).to_numpy(dtype=np.float64, copy=True)
+
+    def _recompute(self, start: int):
+        rv, iv = self._rv[start:], self._iv[start:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spread = iv - rv
+            vrp = iv * iv - rv * rv
+            ratio = iv / rv
+        ratio[~np.isfinite(ratio)] = np.nan
+
+        if start == 0:
+            self._spread, self._vrp, self._ratio = spread, vrp, ratio
+            self._sums = kernels.prefix_sums(spread)
+            self._sums_sq = kernels.prefix_sums(spread * spread)
+        else:
+            n_rows = len(self.index)
+            self._spread, self._vrp, self._ratio, self._z = (
+                _grow(a, n_rows) for a in (self._spread, self._vrp, self._ratio, self._z))
+            self._sums = tuple(_grow(a, n_rows) for a in self._sums)
+            self._sums_sq = tuple(_grow(a, n_rows) for a in self._sums_sq)
+            self._spread[start:], self._vrp[start:], self._ratio[start:] = spread, vrp, ratio
+            for prefix, values in ((self._sums, spread), (self._sums_sq, spread * spread)):
+                csum, ccount = kernels.prefix_sums(values)
+                prefix[0][start:] = csum + prefix[0][start - 1]
+                prefix[1][start:] = ccount + prefix[1][start - 1]
+
+        z = self._zscores(np.arange(start, len(self.index)))
+        if start == 0:
+            self._z = z
+        else:
+            self._z[start:] = z
+
+    def _prior_window(self, prefix, rows: np.ndarray) -> tuple:
+        # Sums over rows [i - lookback, i) for each i, from the running prefix sums
+        csum, ccount = prefix
+        end = rows - 1
+        begin = rows - 1 - self.lookback
+        zero_sum, zero_count = np.zeros(csum.shape[1]), np.zeros(ccount.shape[1], dtype=ccount.dtype)
+        at_end = np.where((end >= 0)[:, None], csum[np.maximum(end, 0)], zero_sum)
+        at_begin = np.where((begin >= 0)[:, None], csum[np.maximum(begin, 0)], zero_sum)
+        count_end = np.where((end >= 0)[:, None], ccount[np.maximum(end, 0)], zero_count)
+        count_begin = np.where((begin >= 0)[:, None], ccount[np.maximum(begin, 0)], zero_count)
+        return at_end - at_begin, count_end - count_begin
+
+    def _zscores(self, rows: np.ndarray) -> np.ndarray:
+        sums, counts = self._prior_window(self._sums, rows)
+        sums_sq, _ = self._prior_window(self._sums_sq, rows)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = sums / counts
+            var = (sums_sq - sums * mean) / (counts - 1)
+            z = (self._spread[rows] - mean) / np.sqrt(np.maximum(var, 0.0))
+        z[(counts < self.min_periods) | ~np.isfinite(z)] = np.nan
+        return z
+
+    def _merge(self, side: str, rows: pd.DataFrame):
+        index = self.index.union(rows.index)
+        tickers = list(dict.fromkeys([*self.tickers, *rows.columns]))
+        # Appending dates keeps every earlier row in place; inserts or new tickers recompute it all
+        in_place = index[:len(self.index)].equals(self.index) and len(tickers) == len(self.tickers)
+        if len(index) != len(self.index) or len(tickers) != len(self.tickers):
+            old = pd.DataFrame(self._rv, index=self.index, columns=self.tickers), \
+                  pd.DataFrame(self._iv, index=self.index, columns=self.tickers)
+            self.index, self.tickers = index, tickers
+            self._rv, self._iv = self._aligned(old[0]), self._aligned(old[1])
+
+        target = self._rv if side == 'realized' else self._iv
+        positions = self.index.get_indexer(rows.index)
+        columns = [self.tickers.index(ticker) for ticker in rows.columns]
+        values = rows.to_numpy(dtype=np.float64)
+        # NaN in an update means "no new value", not "erase the old one"
+        current = target[np.ix_(positions, columns)]
+        target[np.ix_(positions, columns)] = np.where(np.isnan(values), current, values)
+
+        start = int(positions.min()) if in_place and len(positions) else 0
+        self._recompute(start)
+
+    def update_realized(self, rows: pd.DataFrame):
+        self._merge('realized', rows)
+
+    def update_implied(self, rows: pd.DataFrame):
+        self._merge('implied', rows)
+
+    def _frame(self, values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=self.index, columns=self.tickers)
+
+    @property
+    def realized(self) -> pd.DataFrame:
+        return self._frame(self._rv)
+
+    @property
+    def implied(self) -> pd.DataFrame:
+        return self._frame(self._iv)
+
+    @property
+    def spread(self) -> pd.DataFrame:
+        return self._frame(self._spread)
+
+    @property
+    def vrp(self) -> pd.DataFrame:
+        return self._frame(self._vrp)
+
+    @property
+    def ratio(self) -> pd.DataFrame:
+        return self._frame(self._ratio)
+
+    @property
+    def zscore(self) -> pd.DataFrame:
+        return self._frame(self._z)
+
+    def snapshot(self, date=None) -> pd.DataFrame:
+        # One row per ticker on `date` (default: latest), most stretched spreads first
+        row = len(self.index) - 1 if date is None else self.index.get_loc(pd.Timestamp(date))
+        snapshot = pd.DataFrame(
+            np.column_stack([a[row] for a in (self._rv, self._iv, self._spread, self._vrp, self._ratio, self._z)]),
+            index=pd.Index(self.tickers, name='Ticker'),
+            columns=SNAPSHOT_COLUMNS,
+        )
+        return snapshot.sort_values('ZScore', key=np.abs, ascending=False, na_position='last')
+
+    def anomalies(self, threshold: float = 2.0, date=None) -> pd.DataFrame:
+        snapshot = self.snapshot(date)
+        return snapshot[snapshot['ZScore'].abs() > threshold]
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, NamedTuple
+from scipy.interpolate import PchipInterpolator
+from implied_vol.solver import implied_volatility
+
+DEFAULT_K_GRID = np.round(np.linspace(-0.5, 0.5, 41), 4)
+
+
+class SurfaceSlice(NamedTuple):
+    expiry: pd.Timestamp
+    t: float
+    k: np.ndarray
+    w: np.ndarray
+    interpolant: object
+
+    def total_variance(self, k: np.ndarray) -> np.ndarray:
+        # Flat beyond the quoted wings; PCHIP never overshoots between quotes
+        k = np.clip(k, self.k[0], self.k[-1])
+        if self.interpolant is None:
+            return np.full(k.shape, self.w[0])
+        return np.maximum(self.interpolant(k), 0.0)
+
+
+# Implied vol surface for one underlying in (log-moneyness k = ln(K/F), expiry) space.
+# Each expiry slice is a PCHIP interpolant of total variance w = IV^2 * T over the OTM quotes;
+# across expiries w is made non-decreasing and interpolated linearly in T, so the surface
+# has no calendar arbitrage. Only slices whose quote inputs change are refit on update.
+class VolSurface:
+    def __init__(self, rate: float = 0.0, dividend: float = 0.0, k_grid: np.ndarray = DEFAULT_K_GRID):
+        self.rate = rate
+        self.dividend = dividend
+        self.k_grid = np.asarray(k_grid, dtype=np.float64)
+        self._slices: Dict[pd.Timestamp, SurfaceSlice] = {}
+        self._keys: Dict[pd.Timestamp, int] = {}
+        self._ordered = None
+        self._grid = None
+
+    @classmethod
+    def from_quotes(cls, quotes: pd.DataFrame, **kwargs) -> 'VolSurface':
+        surface = cls(**kwargs)
+        surface.update(quotes)
+        return surface
+
+    @property
+    def expiries(self) -> List[pd.Timestamp]:
+        return [s.expiry for s in self._sorted_slices()]
+
+    def _slice_inputs(self, quotes: pd.DataFrame) -> pd.DataFrame:
+        # Everything a slice fit reads, with the surface defaults filled in
+        price = 'IV' if 'IV' in quotes else 'Mid'
+        inputs = quotes[['T', 'Spot', 'Strike', 'IsCall', price]].copy()
+        inputs['Rate'] = quotes['Rate'].fillna(self.rate) if 'Rate' in quotes else self.rate
+        inputs['Dividend'] = quotes['Dividend'].fillna(self.dividend) if 'Dividend' in quotes else self.dividend
+        return inputs
+
+    @staticmethod
+    def _inputs_key(inputs: pd.DataFrame) -> int:
+        # Order-independent hash of the quote rows
+        return int(pd.util.hash_pandas_object(inputs, index=False).sum())
+
+    def _fit_slice(self, expiry: pd.Timestamp, quotes: pd.DataFrame):
+        t = float(quotes['T'].median())
+        if t <= 0:
+            return None
+        rates = quotes['Rate'].to_numpy(dtype=np.float64)
+        dividends = quotes['Dividend'].to_numpy(dtype=np.float64)
+        spot = quotes['Spot'].to_numpy(dtype=np.float64)
+        expiry_t = quotes['T'].to_numpy(dtype=np.float64)
+        strike = quotes['Strike'].to_numpy(dtype=np.float64)
+        if 'IV' in quotes:
+            iv = quotes['IV'].to_numpy(dtype=np.float64)
+        else:
+            iv = implied_volatility(quotes['Mid'].to_numpy(dtype=np.float64), spot, strike, expiry_t,
+                                    rates, quotes['IsCall'].to_numpy(), dividends)
+
+        forward = spot * np.exp((rates - dividends) * expiry_t)
+        k = np.log(strike / forward)
+        is_call = quotes['IsCall'].to_numpy()
+        # OTM quotes only: the ITM side carries little time value and noisier IVs
+        use = np.isfinite(iv) & np.where(is_call, k >= 0, k <= 0)
+        if not use.any():
+            return None
+
+        points = pd.Series(iv[use] ** 2 * expiry_t[use]).groupby(np.round(k[use], 10)).mean()
+        k, w = points.index.to_numpy(dtype=np.float64), points.to_numpy()
+        interpolant = PchipInterpolator(k, w, extrapolate=False) if len(k) > 1 else None
+        return SurfaceSlice(expiry, t, k, w, interpolant)
+
+    def update(self, quotes: pd.DataFrame) -> List[pd.Timestamp]:
+        # Quotes replace the whole surface: expiries absent from them are dropped, and only
+        # expiries whose quote inputs hash differently are re-solved and refit
+        refit = []
+        incoming = set()
+        for expiry, slice_quotes in quotes.groupby('Expiry', sort=True):
+            incoming.add(expiry)
+            inputs = self._slice_inputs(slice_quotes)
+            key = self._inputs_key(inputs)
+            if self._keys.get(expiry) == key:
+                continue
+            self._keys[expiry] = key
+
+            fitted = self._fit_slice(expiry, inputs)
+            if fitted is None:
+                if self._slices.pop(expiry, None) is not None:
+                    refit.append(expiry)
+                continue
+            self._slices[expiry] = fitted
+            refit.append(expiry)
+
+        for expiry in set(self._keys) - incoming:
+            del self._keys[expiry]
+            if self._slices.pop(expiry, None) is not None:
+                refit.append(expiry)
+
+        if refit:
+            self._ordered = None
+            self._grid = None
+        return refit
+
+    def drop_expired(self, as_of) -> List[pd.Timestamp]:
+        expired = [expiry for expiry in self._slices if expiry <= pd.Timestamp(as_of)]
+        for expiry in expired:
+            del self._slices[expiry]
+            self._keys.pop(expiry, None)
+        if expired:
+            self._ordered = None
+            self._grid = None
+        return expired
+
+    def _sorted_slices(self) -> List[SurfaceSlice]:
+        if self._ordered is None:
+            self._ordered = sorted(self._slices.values(), key=lambda s: s.t)
+        return self._ordered
+
+    def _slice_variances(self, k: np.ndarray) -> np.ndarray:
+        slices = self._sorted_slices()
+        w = np.vstack([s.total_variance(k) for s in slices])
+        return np.maximum.accumulate(w, axis=0)
+
+    def total_variance(self, k, t) -> np.ndarray:
+        slices = self._sorted_slices()
+        if not slices:
+            raise ValueError("Surface has no expiry slices")
+        k, t = np.broadcast_arrays(np.asarray(k, dtype=np.float64), np.asarray(t, dtype=np.float64))
+        shape = k.shape
+        k, t = k.ravel(), t.ravel()
+
+        w = self._slice_variances(k)
+        ts = np.array([s.t for s in slices])
+        cols = np.arange(len(k))
+        if len(ts) == 1:
+            return (w[0] * t / ts[0]).reshape(shape)
+
+        # Linear in T between slices; constant vol (w proportional to T) beyond either end
+        hi = np.clip(np.searchsorted(ts, t), 1, len(ts) - 1)
+        lo = hi - 1
+        weight = (t - ts[lo]) / (ts[hi] - ts[lo])
+        inside = w[lo, cols] + weight * (w[hi, cols] - w[lo, cols])
+        result = np.where(t < ts[0], w[0] * t / ts[0], np.where(t > ts[-1], w[-1] * t / ts[-1], inside))
+        return result.reshape(shape)
+
+    def iv(self, k, t) -> np.ndarray:
+        t = np.asarray(t, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.sqrt(self.total_variance(k, t) / t)
+
+    def atm_vol(self, t) -> np.ndarray:
+        return self.iv(0.0, t)
+
+    def grid(self) -> pd.DataFrame:
+        # IV on k_grid at every fitted expiry, cached until a slice is refit
+        if self._grid is None:
+            slices = self._sorted_slices()
+            if not slices:
+                return pd.DataFrame(columns=self.k_grid)
+            w = self._slice_variances(self.k_grid)
+            ts = np.array([s.t for s in slices])
+            self._grid = pd.DataFrame(np.sqrt(w / ts[:, None]), columns=pd.Index(self.k_grid, name='k'),
+                                      index=pd.Index([s.expiry for s in slices], name='Expiry'))
+        return self._grid
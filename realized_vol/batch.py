@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import List
+from realized_vol.data_loader import MarketDataLoader
+from realized_vol.bulk_loader import BulkLoader
+from realized_vol.panel_engine import PanelVolEngine, VOL_TYPES
+from realized_vol.sources import LocalFileSource, YahooSource
+from realized_vol.price_panel import fields_for
+
+MANIFEST = '_manifest.json'
+DONE_DIR = '_done'
+
+# Set in each worker by _attach; the price panel is mapped, never pickled per task
+_shared = {}
+
+
+def load_universe(universe: str, loader: MarketDataLoader) -> List[str]:
+    if universe == 'sp500':
+        return loader.get_sp500_tickers()
+    if os.path.exists(universe):
+        if universe.endswith('.csv'):
+            table = pd.read_csv(universe)
+            column = 'Symbol' if 'Symbol' in table.columns else table.columns[0]
+            return table[column].astype(str).str.strip().tolist()
+        with open(universe) as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    return [ticker.strip().upper() for ticker in universe.split(',') if ticker.strip()]
+
+
+def _attach(shm_name: str, shape: tuple, index: np.ndarray, tickers: list, fields: tuple):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _shared.update(
+        shm=shm,
+        fields=fields,
+        panel=np.ndarray(shape, dtype=np.float64, buffer=shm.buf),
+        index=pd.DatetimeIndex(index, name='Date'),
+        tickers=tickers,
+    )
+
+
+def _atomic_write(path: str, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _atomic_parquet(frame: pd.DataFrame, path: str):
+    _atomic_write(path, lambda tmp_path: frame.to_parquet(tmp_path, index=False))
+
+
+def _atomic_json(payload: dict, path: str):
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, indent=2)
+    _atomic_write(path, write)
+
+
+def _run_shard(shard: int, lo: int, hi: int, windows: list, vol_types: list, output: str) -> dict:
+    started = time.perf_counter()
+    panel = _shared['panel']
+    tickers = _shared['tickers'][lo:hi]
+    # Tickers that failed to load are all-NaN columns and produce no rows
+    priced = int((~np.isnan(panel[:, :, lo:hi])).any(axis=(0, 1)).sum())
+    fields = {field: panel[i, :, lo:hi] for i, field in enumerate(_shared['fields'])}
+    engine = PanelVolEngine.from_arrays(_shared['index'], tickers, fields)
+
+    rows = 0
+    for window in windows:
+        frame = engine.compute_cube([window], vol_types)[window].reset_index()
+        frame = frame.dropna(subset=vol_types, how='all')
+        _atomic_parquet(frame, os.path.join(output, f"window={window}", f"shard={shard:05d}.parquet"))
+        rows += len(frame)
+
+    # The marker is written last, so a crash mid-shard reruns the whole shard
+    _atomic_json({'tickers': tickers, 'rows': rows}, os.path.join(output, DONE_DIR, f"shard={shard:05d}.json"))
+    return {'shard': shard, 'tickers': priced, 'rows': rows, 'elapsed': time.perf_counter() - started}
+
+
+def _read_manifest(output: str) -> dict:
+    path = os.path.join(output, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _clear_output(output: str):
+    # Partitions and markers from an earlier run; anything else in the directory is left alone
+    for name in os.listdir(output):
+        path = os.path.join(output, name)
+        if os.path.isdir(path) and name.startswith('window='):
+            shutil.rmtree(path)
+    for name in os.listdir(os.path.join(output, DONE_DIR)):
+        os.remove(os.path.join(output, DONE_DIR, name))
+
+
+def _check_manifest(output: str, manifest: dict, overwrite: bool):
+    previous = _read_manifest(output)
+    if previous is not None and not overwrite:
+        if previous != manifest:
+            raise SystemExit(f"{output} holds a run with different parameters; use --overwrite or a new --output")
+    else:
+        if overwrite:
+            _clear_output(output)
+        _atomic_json(manifest, os.path.join(output, MANIFEST))
+
+
+def run(args: argparse.Namespace):
+    source = LocalFileSource(args.source_dir) if args.source_dir else YahooSource()
+    bulk = BulkLoader(source, batch_size=args.batch_size, max_workers=args.fetch_workers)
+    loader = MarketDataLoader(cache_dir=args.cache_dir, source=source, bulk_loader=bulk)
+
+    tickers = sorted(set(load_universe(args.universe, loader)))
+    windows = sorted({int(w) for w in args.windows.split(',')})
+    vol_types = [v.strip() for v in args.estimators.split(',')] if args.estimators else list(VOL_TYPES)
+    unknown = set(vol_types) - set(VOL_TYPES)
+    if unknown:
+        raise SystemExit(f"Unknown estimators: {sorted(unknown)}")
+
+    os.makedirs(os.path.join(args.output, DONE_DIR), exist_ok=True)
+    # Without --end a resumed run keeps the end date the run started with, not today's
+    previous = None if args.overwrite else _read_manifest(args.output)
+    end = args.end or (previous or {}).get('end') or pd.Timestamp.now().strftime('%Y-%m-%d')
+    manifest = {'tickers': tickers, 'start': args.start, 'end': end, 'windows': windows,
+                'estimators': vol_types, 'shard_size': args.shard_size}
+    _check_manifest(args.output, manifest, args.overwrite)
+
+    shards = [(shard, lo, min(lo + args.shard_size, len(tickers)))
+              for shard, lo in enumerate(range(0, len(tickers), args.shard_size))]
+    pending = [s for s in shards if not os.path.exists(os.path.join(args.output, DONE_DIR, f"shard={s[0]:05d}.json"))]
+    print(f"{len(tickers)} tickers in {len(shards)} shards, {len(shards) - len(pending)} already done")
+    if not pending:
+        return
+
+    fetch_started = time.perf_counter()
+    prices = loader.fetch_price_series(tuple(tickers), args.start, end, fields=fields_for(vol_types))
+    fetch_elapsed = time.perf_counter() - fetch_started
+
+    # Dates x tickers panel per field the estimators read, in universe order; failed tickers stay as NaN columns
+    index = prices.index
+    fields = fields_for(vol_types)
+    shape = (len(fields), len(index), len(tickers))
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+    try:
+        panel = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        for i, field in enumerate(fields):
+            panel[i] = prices[field].reindex(columns=tickers).to_numpy(dtype=np.float64)
+        # Judged from the prices themselves: loader.failures accumulates over the loader's life
+        missing = [t for t, empty in zip(tickers, np.isnan(panel).all(axis=(0, 1))) if empty]
+        if missing:
+            print(f"{len(missing)} tickers failed to load: {missing[:20]}")
+        print(f"Loaded {len(index)} dates for {len(tickers) - len(missing)} tickers in {fetch_elapsed:.1f}s")
+
+        compute_started = time.perf_counter()
+        done_tickers = done_rows = 0
+        initargs = (shm.name, shape, index.to_numpy(), tickers, fields)
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_attach, initargs=initargs) as executor:
+            futures = [executor.submit(_run_shard, shard, lo, hi, windows, vol_types, args.output)
+                       for shard, lo, hi in pending]
+            for future in as_completed(futures):
+                result = future.result()
+                done_tickers += result['tickers']
+                done_rows += result['rows']
+                elapsed = time.perf_counter() - compute_started
+                print(f"shard {result['shard']:05d}: {result['tickers']} tickers, {result['rows']} rows "
+                      f"in {result['elapsed']:.2f}s ({done_tickers / elapsed:.1f} tickers/s overall)")
+
+        elapsed = time.perf_counter() - compute_started
+        print(f"Computed {done_tickers} tickers, {done_rows} rows in {elapsed:.1f}s: "
+              f"{done_tickers / elapsed:.1f} tickers/s, {done_rows / elapsed:,.0f} rows/s")
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compute realized volatility estimators for a ticker universe.")
+    parser.add_argument('--universe', default='sp500',
+                        help="'sp500', a file of tickers (one per line, or a CSV with a Symbol column), or a comma list")
+    parser.add_argument('--start', default='2000-01-01')
+    parser.add_argument('--end', default=None, help="Exclusive end date (default: today, or the resumed run's end)")
+    parser.add_argument('--windows', default='21', help="Comma-separated window lengths in days")
+    parser.add_argument('--estimators', default=None, help="Comma-separated estimator names (default: all)")
+    parser.add_argument('--output', required=True, help="Output directory for window=/shard= Parquet partitions")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--shard-size', type=int, default=25)
+    parser.add_argument('--batch-size', type=int, default=50, help="Tickers per download request")
+    parser.add_argument('--fetch-workers', type=int, default=4)
+    parser.add_argument('--cache-dir', default=None)
+    parser.add_argument('--source-dir', default=None, help="Replay prices from local Parquet/CSV files instead of Yahoo")
+    parser.add_argument('--overwrite', action='store_true', help="Discard a previous run in --output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    run(parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import time
+import pandas as pd
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, NamedTuple
+from realized_vol.sources import PriceSource, YahooSource, assemble_panel, split_by_ticker
+
+
+class BatchResult(NamedTuple):
+    tickers: List[str]
+    frames: Dict[str, pd.DataFrame]
+    failures: Dict[str, str]
+    attempts: int
+    elapsed: float
+    # Downloaded without error but no rows, e.g. a weekend or pre-listing range; not a failure
+    empty: List[str] = ()
+
+
+class BulkLoadResult:
+    def __init__(self):
+        self.frames: Dict[str, pd.DataFrame] = {}
+        self.failures: Dict[str, str] = {}
+        self.empty: List[str] = []
+        self.elapsed = 0.0
+
+    def add(self, batch: BatchResult):
+        self.frames.update(batch.frames)
+        self.failures.update(batch.failures)
+        self.empty.extend(batch.empty)
+
+    @property
+    def succeeded(self) -> List[str]:
+        return list(self.frames)
+
+    @property
+    def failed(self) -> List[str]:
+        return list(self.failures)
+
+    def to_frame(self) -> pd.DataFrame:
+        if not self.frames:
+            return pd.DataFrame()
+        return assemble_panel(self.frames)
+
+
+class BulkLoader:
+    def __init__(self, source: PriceSource = None, batch_size: int = 50, max_workers: int = 4,
+                 max_retries: int = 3, backoff: float = 1.0, fallback_timeout: float = 60.0):
+        self.source = source or YahooSource()
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.fallback_timeout = fallback_timeout
+
+    def _fetch_batch(self, tickers: List[str], start: str, end: str, deadline: float = None) -> BatchResult:
+        # A multi-ticker batch that exhausts its retries raises, so iter_load can split it;
+        # past the deadline a ticker gets one attempt and no backoff
+        started = time.perf_counter()
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                df = self.source.download(tickers, start, end)
+                break
+            except Exception as e:
+                delay = self.backoff * 2 ** (attempts - 1)
+                out_of_time = deadline is not None and time.monotonic() + delay > deadline
+                if attempts <= self.max_retries and not out_of_time:
+                    time.sleep(delay)
+                    continue
+                if len(tickers) > 1:
+                    raise
+                failures = {tickers[0]: f"{type(e).__name__}: {e}"}
+                return BatchResult(tickers, {}, failures, attempts, time.perf_counter() - started)
+
+        frames = split_by_ticker(df, tickers)
+        empty = [ticker for ticker in tickers if ticker not in frames]
+        return BatchResult(tickers, frames, {}, attempts, time.perf_counter() - started, empty)
+
+    def batches(self, tickers: List[str]) -> List[List[str]]:
+        tickers = list(dict.fromkeys(tickers))
+        return [tickers[i:i + self.batch_size] for i in range(0, len(tickers), self.batch_size)]
+
+    def iter_load(self, tickers: List[str], start: str, end: str) -> Iterator[BatchResult]:
+        # Yields each batch as soon as it completes. A failed batch falls back to one symbol
+        # at a time on the same pool, so a bad name cannot sink its batch or stall the run
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {executor.submit(self._fetch_batch, batch, start, end): batch
+                       for batch in self.batches(tickers)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception:
+                        if len(batch) == 1:
+                            raise
+                        deadline = time.monotonic() + self.fallback_timeout
+                        for ticker in batch:
+                            pending[executor.submit(self._fetch_batch, [ticker], start, end, deadline)] = [ticker]
+                        continue
+                    yield result
+
+    def load(self, tickers: List[str], start: str, end: str) -> BulkLoadResult:
+        started = time.perf_counter()
+        result = BulkLoadResult()
+        for batch in self.iter_load(tickers, start, end):
+            result.add(batch)
+        result.elapsed = time.perf_counter() - started
+        return result
@@ -1 +1,32 @@
-TRADING_DAYS_PER_YEAR = 252
\ No newline at end of file
+import os
+
+TRADING_DAYS_PER_YEAR = 252
+
+PRICE_CACHE_DIR = os.environ.get(
+    'VOL_PRICE_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'market-volatility-engine', 'prices'),
+)
+PRICE_CACHE_MAX_BYTES = int(os.environ.get('VOL_PRICE_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+FRAME_CACHE_DIR = os.environ.get(
+    'VOL_FRAME_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'market-volatility-engine', 'frames'),
+)
+FRAME_CACHE_MAX_BYTES = int(os.environ.get('VOL_FRAME_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+VOL_RESULT_CACHE_MAX_BYTES = int(os.environ.get('VOL_RESULT_CACHE_MAX_BYTES', 128 * 1024 * 1024))
+
+# <UNDERLYING>.parquet/.csv option chain snapshots for the implied vol surface tab
+OPTION_CHAIN_DIR = os.environ.get(
+    'VOL_OPTION_CHAIN_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'market-volatility-engine', 'option-chains'),
+)
+RISK_FREE_RATE = float(os.environ.get('VOL_RISK_FREE_RATE', 0.0))
+
+# Set to a directory to dump a cProfile .prof file for every dashboard request
+PROFILE_DIR = os.environ.get('VOL_PROFILE_DIR')
+
+# Background refresh of the dashboard's watch-list and recently viewed requests
+PREFETCH_ENABLED = os.environ.get('VOL_PREFETCH', '1') != '0'
+PREFETCH_WATCHLIST = [t.strip().upper() for t in os.environ.get('VOL_WATCHLIST', 'AAPL,MSFT,GOOG').split(',') if t.strip()]
+PREFETCH_INTERVAL_S = float(os.environ.get('VOL_PREFETCH_INTERVAL_S', 15 * 60))
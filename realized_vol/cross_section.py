@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+from realized_vol.config import TRADING_DAYS_PER_YEAR
+from realized_vol import kernels
+
+AGGREGATE_COLUMNS = ['Vol', 'AvgVol', 'AvgCorrelation', 'Dispersion', 'Members']
+INDEX_GROUP = 'Index'
+
+
+# Precomputed ticker -> group membership as a (group x ticker) equal-weight matrix, so
+# every group aggregate is one matrix product over the ticker axis. The whole universe
+# is added as INDEX_GROUP unless include_index is False.
+class SectorIndex:
+    def __init__(self, tickers: list, groups, include_index: bool = True):
+        groups = pd.Series(groups).reindex(list(tickers))
+        self.tickers = list(tickers)
+        names = sorted(groups.dropna().unique())
+        codes = pd.Categorical(groups, categories=names).codes
+
+        membership = np.zeros((len(names), len(self.tickers)))
+        assigned = codes >= 0
+        membership[codes[assigned], np.flatnonzero(assigned)] = 1.0
+        if include_index:
+            names = names + [INDEX_GROUP]
+            membership = np.vstack([membership, np.ones(len(self.tickers))])
+
+        self.names = names
+        self.membership = membership
+
+    @classmethod
+    def from_sp500(cls, loader, tickers: list = None, **kwargs) -> 'SectorIndex':
+        sectors = loader.get_sp500_sectors()
+        return cls(tickers if tickers is not None else list(sectors.index), sectors, **kwargs)
+
+    @property
+    def sizes(self) -> pd.Series:
+        return pd.Series(self.membership.sum(axis=1).astype(int), index=self.names)
+
+
+def group_aggregates(returns: pd.DataFrame, groups: SectorIndex, window: int = 63,
+                     annualized: bool = True) -> pd.DataFrame:
+    # Tidy (Date, Group) rows. For an equal-weight group portfolio P,
+    #   var(P) = sum w_i^2 s_i^2 + sum_{i != j} w_i w_j s_i s_j rho_ij
+    # so the (vol-weighted) average pairwise correlation comes from the member vols and
+    # the portfolio vol alone, without building any pairwise series.
+    values = returns.reindex(columns=groups.tickers).to_numpy(dtype=np.float64)
+    vols = kernels.rolling_std(values, window)
+
+    # Members drop out of a group while their window is incomplete
+    active = ~np.isnan(vols)
+    members = active.astype(np.float64) @ groups.membership.T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weights_sum = np.where(active, vols, 0.0) @ groups.membership.T
+        avg_vol = weights_sum / members
+        # Equal-weight portfolio return per group over the members with a full window
+        in_window = ~np.isnan(values) & active
+        portfolio = (np.where(in_window, values, 0.0) @ groups.membership.T) / (in_window @ groups.membership.T)
+        portfolio_vol = kernels.rolling_std(portfolio, window)
+
+        sum_sq = np.where(active, vols * vols, 0.0) @ groups.membership.T / members ** 2
+        cross = avg_vol * avg_vol - sum_sq
+        avg_corr = (portfolio_vol * portfolio_vol - sum_sq) / cross
+    avg_corr[~np.isfinite(avg_corr)] = np.nan
+
+    scale = np.sqrt(TRADING_DAYS_PER_YEAR) if annualized else 1.0
+    frames = {
+        'Vol': portfolio_vol * scale,
+        'AvgVol': avg_vol * scale,
+        'AvgCorrelation': avg_corr,
+        # What a long-members / short-group dispersion trade earns on: member vol over group vol
+        'Dispersion': (avg_vol - portfolio_vol) * scale,
+        'Members': members,
+    }
+    index = pd.MultiIndex.from_product([returns.index, groups.names], names=['Date', 'Group'])
+    return pd.DataFrame({name: block.reshape(-1) for name, block in frames.items()}, index=index)
+
+
+# Pairwise-complete rolling covariance and correlation over the last `window` rows,
+# updated one day at a time. Memory is the window of returns plus a few (ticker x ticker)
+# running sums, whatever the history length; sums are rebuilt from the buffer once per
+# window to keep rounding drift out.
+class RollingCorrelation:
+    def __init__(self, tickers: list, window: int = 63, min_periods: int = None):
+        self.tickers = list(tickers)
+        self.window = window
+        self.min_periods = min_periods or window
+        n = len(self.tickers)
+        self._buffer = np.full((window, n), np.nan)
+        self._position = 0
+        self._updates = 0
+        self._count = np.zeros((n, n))
+        self._sum = np.zeros((n, n))
+        self._sum_sq = np.zeros((n, n))
+        self._cross = np.zeros((n, n))
+        self.last_date = None
+
+    @classmethod
+    def from_returns(cls, returns: pd.DataFrame, window: int = 63, **kwargs) -> 'RollingCorrelation':
+        rolling = cls(list(returns.columns), window, **kwargs)
+        for date, row in zip(returns.index[-window:], returns.to_numpy(dtype=np.float64)[-window:]):
+            rolling.update(row, date)
+        return rolling
+
+    def _accumulate(self, row: np.ndarray, sign: float):
+        valid = (~np.isnan(row)).astype(np.float64)
+        filled = np.where(valid > 0, row, 0.0)
+        self._count += sign * np.outer(valid, valid)
+        # _sum[i, j] is the sum of r_i over the rows where both i and j are present
+        self._sum += sign * np.outer(filled, valid)
+        self._sum_sq += sign * np.outer(filled * filled, valid)
+        self._cross += sign * np.outer(filled, filled)
+
+    def _rebuild(self):
+        for total in (self._count, self._sum, self._sum_sq, self._cross):
+            total[:] = 0.0
+        for row in self._buffer:
+            self._accumulate(row, 1.0)
+
+    def update(self, row, date=None):
+        if isinstance(row, pd.Series):
+            row = row.reindex(self.tickers)
+        row = np.asarray(row, dtype=np.float64)
+        self._accumulate(self._buffer[self._position], -1.0)
+        self._accumulate(row, 1.0)
+        self._buffer[self._position] = row
+        self._position = (self._position + 1) % self.window
+        self._updates += 1
+        if self._updates % self.window == 0:
+            self._rebuild()
+        self.last_date = date
+
+    def _moments(self):
+        n = self._count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_i = self._sum / n
+            cov = (self._cross - self._sum * self._sum.T / n) / (n - 1)
+            var = (self._sum_sq - self._sum * mean_i) / (n - 1)
+        cov[n < self.min_periods] = np.nan
+        return cov, var
+
+    def covariance(self) -> pd.DataFrame:
+        cov, _ = self._moments()
+        return pd.DataFrame(cov, index=self.tickers, columns=self.tickers)
+
+    def correlation(self) -> pd.DataFrame:
+        cov, var = self._moments()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.sqrt(np.maximum(var, 0.0) * np.maximum(var.T, 0.0))
+        np.fill_diagonal(corr, np.where(np.isnan(np.diag(cov)), np.nan, 1.0))
+        return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=self.tickers, columns=self.tickers)
+
+    def average_correlation(self, groups: SectorIndex = None) -> pd.Series:
+        # Mean off-diagonal correlation per group (or over the whole universe)
+        corr = self.correlation().to_numpy()
+        np.fill_diagonal(corr, np.nan)
+        if groups is None:
+            return pd.Series({INDEX_GROUP: np.nanmean(corr)})
+        membership = groups.membership[:, [groups.tickers.index(t) for t in self.tickers]]
+        valid = ~np.isnan(corr)
+        filled = np.where(valid, corr, 0.0)
+        totals = np.einsum('gi,ij,gj->g', membership, filled, membership)
+        counts = np.einsum('gi,ij,gj->g', membership, valid.astype(np.float64), membership)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.Series(totals / counts, index=groups.names)
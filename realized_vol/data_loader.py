@@ -1,56 +1,158 @@
-import yfinance as yf
+import numpy as np
 import pandas as pd
 import requests
 from datetime import datetime
 from functools import lru_cache
-import hashlib
+from realized_vol.config import PRICE_CACHE_MAX_BYTES
+from realized_vol.price_store import PriceStore, as_day, clip_dates
+from realized_vol.fetch_planner import has_trading_days, next_session, plan_fetch
+from realized_vol.bulk_loader import BulkLoader
+from realized_vol.sources import PriceSource, YahooSource, assemble_panel, split_by_ticker
+from realized_vol.price_panel import PricePanel
+from realized_vol import metrics
 
 class MarketDataLoader:
-    def __init__(self, tickers: list=None, start: str = "2020-01-01", end: str = None):
+    def __init__(self, tickers: list=None, start: str = "2020-01-01", end: str = None,
+                 cache_dir: str = None, max_cache_bytes: int = PRICE_CACHE_MAX_BYTES, source: PriceSource = None,
+                 bulk_loader: BulkLoader = None):
         self.tickers = tickers
         self.start = start
         self.end = end or datetime.now().strftime('%Y-%m-%d')
-        self._current_cache_keys = set()
-
-    def _generate_cache_key(self, tickers: tuple, start: str, end: str) -> str:
-        key_str = f"{tickers}_{start}_{end}"
-        return hashlib.md5(key_str.encode()).hexdigest()
-    
-    @lru_cache(maxsize=32)
-    def _cached_fetch(self, cache_key: str, tickers: tuple, start: str, end: str) -> pd.DataFrame:
-        ticker_list = list(tickers) if isinstance(tickers, tuple) else tickers
-        df = yf.download(ticker_list, start=start, end=end, progress=False)
-        if df.empty:
+        self.store = PriceStore(cache_dir, max_cache_bytes)
+        self.source = source or YahooSource()
+        self.bulk_loader = bulk_loader
+        self.failures = {}
+
+    def _download(self, tickers: list, start: str, end: str):
+        failed = set()
+        with metrics.timer('loader.download'):
+            if self.bulk_loader is None:
+                df = self.source.download(tickers, start, end)
+            else:
+                # Chunked, retried and tolerant of bad symbols; failures are kept for the caller
+                result = self.bulk_loader.load(tickers, start, end)
+                self.failures.update(result.failures)
+                failed = set(result.failures)
+                metrics.increment('loader.download_failures', len(result.failures))
+                df = result.to_frame()
+
+        if df is not None:
+            metrics.increment('loader.rows_fetched', len(df))
+            metrics.increment('loader.bytes_fetched', int(df.memory_usage(index=True).sum()))
+        return df, failed
+
+    @staticmethod
+    def _answered_until(frame: pd.DataFrame) -> pd.Timestamp:
+        # Returned bars answer for everything up to the session after the last one
+        index = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+        return next_session(as_day(index[-1]) + pd.Timedelta(days=1))
+
+    @staticmethod
+    def _merge(existing: pd.DataFrame, segments: list) -> pd.DataFrame:
+        frames = [frame for frame in [existing, *segments] if frame is not None and not frame.empty]
+        if not frames:
+            return existing
+        merged = pd.concat(frames)
+        return merged[~merged.index.duplicated(keep='last')].sort_index()
+
+    @metrics.timed('loader.fetch_price_series')
+    def fetch_price_series(self, tickers: tuple = None, start: str = None, end: str = None,
+                           fields: tuple = None, dtype=None, fill: bool = True) -> pd.DataFrame:
+        # fields narrows the result to e.g. ('Close',) and dtype can shrink it to float32;
+        # the store always keeps every field, so later requests for more need no download.
+        # fill=False leaves gaps (and the dtype) to the caller, as fetch_price_panel does
+        tickers = list(dict.fromkeys(tickers or self.tickers))
+        start = as_day(start or self.start)
+        end = as_day(end or self.end)
+        # Today's bar may still be moving, so never record it as held
+        held_until = min(end, as_day(datetime.now()))
+
+        coverage = {ticker: self.store.coverage(ticker) for ticker in tickers}
+        plan = plan_fetch(coverage, start, end)
+        planned = {ticker for segment_tickers in plan.values() for ticker in segment_tickers}
+        metrics.increment('loader.cache_hits', len(tickers) - len(planned))
+        metrics.increment('loader.cache_misses', len(planned))
+
+        fetched, answered = {}, {}
+        for (segment_start, segment_end), segment_tickers in plan.items():
+            df, failed = self._download(segment_tickers, segment_start.strftime('%Y-%m-%d'),
+                                        segment_end.strftime('%Y-%m-%d'))
+            by_ticker = split_by_ticker(df, segment_tickers)
+            for ticker in segment_tickers:
+                # Coverage only grows by what the source actually answered. Returned bars cover the
+                # segment up to the session after the last bar: nothing before the first one means
+                # it was not listed yet. An empty answer is indistinguishable from a swallowed download error, so it
+                # only counts when the segment holds no trading day at all
+                if ticker in failed:
+                    continue
+                if ticker in by_ticker:
+                    fetched.setdefault(ticker, []).append(by_ticker[ticker])
+                    lo, hi = segment_start, self._answered_until(by_ticker[ticker])
+                elif coverage[ticker] is not None and not has_trading_days(segment_start, min(segment_end, held_until)):
+                    lo, hi = segment_start, segment_end
+                else:
+                    continue
+                hi = min(hi, held_until)
+                if ticker in answered:
+                    lo, hi = min(lo, answered[ticker][0]), max(hi, answered[ticker][1])
+                answered[ticker] = (lo, hi)
+
+        frames = {}
+        for ticker in tickers:
+            held = coverage[ticker]
+            if ticker in answered:
+                existing = self.store.read(ticker) if held is not None else None
+                merged = self._merge(existing, fetched.get(ticker, []))
+                if merged is None:
+                    continue
+                held_start, held_end = answered[ticker]
+                if held is not None:
+                    held_start, held_end = min(held_start, held[0]), max(held_end, held[1])
+                self.store.write(ticker, merged, held_start, held_end)
+                frame = clip_dates(merged, start, end)
+                frames[ticker] = frame if fields is None else frame[[f for f in fields if f in frame.columns]]
+            elif held is not None:
+                # Only the requested columns are read from the mapped file
+                frames[ticker] = self.store.read(ticker, start, end, fields)
+
+        frames = {ticker: frame for ticker, frame in frames.items() if frame is not None and not frame.empty}
+        if not frames:
             raise ValueError("Data Not Fetched - check Ticker or date range")
-        
+
+        df = assemble_panel(frames)
+        if not fill:
+            return df
         df = df.ffill().bfill()
+        if dtype is not None:
+            df = df.astype(dtype, copy=False)
         return df
-    
-    def fetch_price_series(self, tickers: tuple, start: str, end: str) -> pd.DataFrame:
-        cache_key = self._generate_cache_key(tickers, start, end)
-
-        self._current_cache_keys.add(cache_key)
 
-        if len(self._current_cache_keys) > 32:
-            oldest_key = next(iter(self._current_cache_keys))
-            self._cached_fetch.cache_clear()
-            self._current_cache_keys = set()
-            print(f"Cleared cache due to size limit (was {len(self._current_cache_keys)} items)")
+    def fetch_price_panel(self, tickers: tuple = None, start: str = None, end: str = None,
+                          fields: tuple = None, dtype=np.float64) -> PricePanel:
+        # Compact (date x ticker) arrays of just the requested fields, e.g. fields_for(vol_types);
+        # the panel fills gaps and casts each field once, when it is first used
+        df = self.fetch_price_series(tickers, start, end, fields=fields, fill=False)
+        return PricePanel.from_frame(df, fields=fields, dtype=dtype)
 
-        return self._cached_fetch(cache_key, tickers, start, end)
-    
     def clear_cache(self):
-        self._cached_fetch.cache_clear()
-        self._current_cache_keys = set()
+        self.store.clear()
+        metrics.increment('loader.cache_clears')
         print("Cache cleared")
-    
-    @lru_cache(maxsize=1)  
-    def get_sp500_tickers(self) -> list:
+
+    @lru_cache(maxsize=1)
+    def get_sp500_table(self) -> pd.DataFrame:
         url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
         tables = pd.read_html(url)
-        sp500_table = tables[0]
+        return tables[0]
+
+    def get_sp500_tickers(self) -> list:
+        sp500_table = self.get_sp500_table()
         tickers = sp500_table['Symbol'].tolist()
         return tickers
-    
-    def set_tickers(self, tickers: list): 
-        self.tickers = tickers
\ No newline at end of file
+
+    def get_sp500_sectors(self) -> pd.Series:
+        sp500_table = self.get_sp500_table()
+        return sp500_table.set_index('Symbol')['GICS Sector']
+
+    def set_tickers(self, tickers: list):
+        self.tickers = tickers
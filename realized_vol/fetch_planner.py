@@ -0,0 +1,63 @@
+import pandas as pd
+from pandas.tseries.holiday import (AbstractHolidayCalendar, GoodFriday, Holiday, USLaborDay, USMartinLutherKingJr,
+                                    USMemorialDay, USPresidentsDay, USThanksgivingDay, nearest_workday,
+                                    sunday_to_monday)
+from pandas.tseries.offsets import CustomBusinessDay
+from typing import Dict, List, Optional, Tuple
+
+Segment = Tuple[pd.Timestamp, pd.Timestamp]
+
+
+# Regular US exchange holidays. Unscheduled closures are left out on purpose: a day wrongly
+# taken for a trading day only costs a refetch, a day wrongly taken for a holiday loses a bar
+class ExchangeHolidayCalendar(AbstractHolidayCalendar):
+    rules = [
+        Holiday('New Year', month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-01-01', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday),
+    ]
+
+
+TRADING_DAY = CustomBusinessDay(calendar=ExchangeHolidayCalendar())
+
+
+def next_session(day: pd.Timestamp) -> pd.Timestamp:
+    # The first trading day on or after day
+    return TRADING_DAY.rollforward(day)
+
+
+def has_trading_days(start: pd.Timestamp, end: pd.Timestamp) -> bool:
+    # Whether the half-open [start, end) holds a session an empty download could have missed
+    if end <= start:
+        return False
+    return len(pd.date_range(start, end - pd.Timedelta(days=1), freq=TRADING_DAY)) > 0
+
+
+def missing_segments(held: Optional[Segment], start: pd.Timestamp, end: pd.Timestamp) -> List[Segment]:
+    if held is None:
+        return [(start, end)]
+
+    held_start, held_end = held
+    segments = []
+    # Head and tail segments run up to the held range so coverage stays one contiguous interval
+    if start < held_start:
+        segments.append((start, held_start))
+    if end > held_end:
+        segments.append((held_end, end))
+    return segments
+
+
+def plan_fetch(coverage: Dict[str, Optional[Segment]], start: pd.Timestamp, end: pd.Timestamp) -> Dict[Segment, List[str]]:
+    # Tickers missing the same segment share one download
+    plan = {}
+    for ticker, held in coverage.items():
+        for segment in missing_segments(held, start, end):
+            plan.setdefault(segment, []).append(ticker)
+    return plan
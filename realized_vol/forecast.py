@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from realized_vol.config import TRADING_DAYS_PER_YEAR
+from realized_vol.price_panel import as_field_ticker_columns
+from realized_vol import kernels
+
+# Set in each walk-forward worker by _attach; the returns panel is sent once per worker
+_shared = {}
+
+
+def returns_panel(price_panel: pd.DataFrame) -> pd.DataFrame:
+    # Gaps inside a ticker's history are forward-filled as in the engines, but rows before its
+    # first price or after its last stay NaN rather than becoming made-up zero returns
+    close = as_field_ticker_columns(price_panel)['Close']
+    values = close.to_numpy(dtype=np.float64)
+    priced = ~np.isnan(values)
+    live = np.logical_or.accumulate(priced, axis=0) & np.logical_or.accumulate(priced[::-1], axis=0)[::-1]
+    valid = np.zeros_like(live)
+    valid[1:] = live[1:] & live[:-1]
+    returns = np.where(valid, kernels.log_returns(kernels.fill_gaps(values)), np.nan)
+    return pd.DataFrame(returns, index=close.index, columns=close.columns)
+
+
+def _annualized(variance: np.ndarray) -> np.ndarray:
+    return np.sqrt(TRADING_DAYS_PER_YEAR * variance)
+
+
+def _horizon_frame(variance: np.ndarray, tickers: list, cumulative: bool) -> pd.DataFrame:
+    # variance is (horizon, ticker) daily variance per step ahead; cumulative averages
+    # steps 1..h, which is the vol to compare with an h-day realized or implied vol
+    if cumulative:
+        variance = np.cumsum(variance, axis=0) / np.arange(1, len(variance) + 1)[:, None]
+    return pd.DataFrame(_annualized(variance).T, index=pd.Index(tickers, name='Ticker'),
+                        columns=pd.RangeIndex(1, len(variance) + 1, name='Horizon'))
+
+
+class EwmaModel:
+    def __init__(self, decay: float = 0.94, seed_window: int = 21):
+        self.decay = decay
+        self.seed_window = seed_window
+
+    def fit(self, returns: pd.DataFrame) -> 'EwmaModel':
+        self.tickers = list(returns.columns)
+        self.variance_ = kernels.ewma_variance(returns.to_numpy(dtype=np.float64), self.decay, self.seed_window)
+        return self
+
+    def conditional_vol(self) -> np.ndarray:
+        return _annualized(self.variance_)
+
+    def forecast(self, horizon: int = 1, cumulative: bool = False) -> pd.DataFrame:
+        # EWMA has no mean reversion: every step ahead carries today's variance
+        variance = np.repeat(self.variance_[-1][None, :], horizon, axis=0)
+        return _horizon_frame(variance, self.tickers, cumulative)
+
+
+def garch_filter(r2: np.ndarray, valid: np.ndarray, omega: np.ndarray, alpha: np.ndarray,
+                 beta: np.ndarray, var0: np.ndarray, keep_path: bool = False):
+    # GARCH(1,1) recursion down the rows for any number of parameter sets at once:
+    # r2 and valid are (time, ticker), the parameters (candidates, ticker). Returns the
+    # Gaussian log-likelihood per candidate (constant dropped) and the next-day variance.
+    variance = np.broadcast_to(var0, np.broadcast(omega, alpha, beta).shape).copy()
+    loglik = np.zeros_like(variance)
+    path = np.empty((len(r2),) + variance.shape) if keep_path else None
+    all_valid = valid.all()
+    for t in range(len(r2)):
+        if keep_path:
+            path[t] = variance
+        if all_valid:
+            loglik -= np.log(variance) + r2[t] / variance
+            shock = r2[t]
+        else:
+            loglik -= np.where(valid[t], np.log(variance) + r2[t] / variance, 0.0)
+            # A missing return is replaced by its expectation, leaving the level unchanged
+            shock = np.where(valid[t], r2[t], variance)
+        variance = omega + alpha * shock + beta * variance
+    return 0.5 * loglik, variance, path
+
+
+# GARCH(1,1) with variance targeting, fitted for every ticker together. The long-run
+# variance is pinned to each ticker's sample variance, leaving (alpha, beta); a shared
+# coarse grid is scored in one batched pass, then each ticker's grid is re-centred on
+# its best point and shrunk for `zoom_rounds` more passes.
+class GarchModel:
+    def __init__(self, grid_size: int = 9, zoom_rounds: int = 5, max_persistence: float = 0.999):
+        self.grid_size = grid_size | 1  # odd, so the current best stays on the grid
+        self.zoom_rounds = zoom_rounds
+        self.max_persistence = max_persistence
+
+    def _score(self, alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
+        ok = (alpha >= 0) & (beta >= 0) & (alpha + beta < self.max_persistence)
+        omega = self.long_run_var_ * (1 - alpha - beta)
+        # Zoomed grids can step outside the constraints; those candidates are masked out
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            loglik, _, _ = garch_filter(self._r2, self._valid, omega, alpha, beta, self.long_run_var_)
+        return np.where(ok, loglik, -np.inf)
+
+    def fit(self, returns: pd.DataFrame) -> 'GarchModel':
+        values = returns.to_numpy(dtype=np.float64)
+        self.tickers = list(returns.columns)
+        self._valid = ~np.isnan(values)
+        centred = values - np.nanmean(values, axis=0)
+        self._r2 = np.where(self._valid, centred * centred, 0.0)
+        self.long_run_var_ = np.nanvar(values, axis=0, ddof=1)
+
+        steps = np.linspace(-1.0, 1.0, self.grid_size)
+        a_grid, b_grid = np.meshgrid(np.linspace(0.0, 0.3, self.grid_size),
+                                     np.linspace(0.5, self.max_persistence, self.grid_size), indexing='ij')
+        alpha = np.broadcast_to(a_grid.reshape(-1, 1), (a_grid.size, len(self.tickers)))
+        beta = np.broadcast_to(b_grid.reshape(-1, 1), alpha.shape)
+        a_span = 0.3 / (self.grid_size - 1)
+        b_span = (self.max_persistence - 0.5) / (self.grid_size - 1)
+
+        cols = np.arange(len(self.tickers))
+        for round_ in range(self.zoom_rounds + 1):
+            if round_:
+                da, db = np.meshgrid(steps * a_span, steps * b_span, indexing='ij')
+                alpha = best_alpha + da.reshape(-1, 1)
+                beta = best_beta + db.reshape(-1, 1)
+                a_span, b_span = a_span * 2 / (self.grid_size - 1), b_span * 2 / (self.grid_size - 1)
+            loglik = self._score(alpha, beta)
+            best = np.argmax(loglik, axis=0)
+            best_alpha, best_beta = alpha[best, cols], beta[best, cols]
+            self.loglik_ = loglik[best, cols]
+
+        self.alpha_, self.beta_ = best_alpha, best_beta
+        self.omega_ = self.long_run_var_ * (1 - best_alpha - best_beta)
+        _, self.next_var_, self.variance_ = garch_filter(
+            self._r2, self._valid, self.omega_, self.alpha_, self.beta_, self.long_run_var_, keep_path=True)
+        return self
+
+    @property
+    def params(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'omega': self.omega_,
+            'alpha': self.alpha_,
+            'beta': self.beta_,
+            'persistence': self.alpha_ + self.beta_,
+            'long_run_vol': _annualized(self.long_run_var_),
+            'loglik': self.loglik_,
+        }, index=pd.Index(self.tickers, name='Ticker'))
+
+    def conditional_vol(self) -> np.ndarray:
+        return _annualized(self.variance_)
+
+    def forecast(self, horizon: int = 1, cumulative: bool = False) -> pd.DataFrame:
+        # E[var_{t+h}] = long_run + persistence^(h-1) * (var_{t+1} - long_run)
+        decay = (self.alpha_ + self.beta_)[None, :] ** np.arange(horizon)[:, None]
+        variance = self.long_run_var_ + decay * (self.next_var_ - self.long_run_var_)
+        return _horizon_frame(variance, self.tickers, cumulative)
+
+
+MODELS = {'ewma': EwmaModel, 'garch': GarchModel}
+
+
+def _attach(returns: pd.DataFrame):
+    _shared['returns'] = returns
+
+
+def _forecast_origin(origin: int, model: str, train: int, horizon: int, model_kwargs: dict) -> pd.DataFrame:
+    returns = _shared['returns']
+    window = returns.iloc[max(origin - train, 0):origin]
+    fitted = MODELS[model](**model_kwargs).fit(window)
+    forecast = fitted.forecast(horizon, cumulative=True)[horizon]
+
+    future = returns.iloc[origin:origin + horizon].to_numpy(dtype=np.float64)
+    realized = _annualized(np.nanmean(future * future, axis=0))
+    return pd.DataFrame({
+        'Origin': returns.index[origin - 1],
+        'Ticker': fitted.tickers,
+        'Forecast': forecast.to_numpy(),
+        'Realized': realized,
+    })
+
+
+def walk_forward(returns: pd.DataFrame, model: str = 'garch', train: int = 756, step: int = 21,
+                 horizon: int = 21, workers: int = None, **model_kwargs) -> pd.DataFrame:
+    # Refits on a rolling `train`-day window every `step` days and scores the h-day vol
+    # forecast against the vol realized over the next h days; origins run on a process pool
+    origins = list(range(train, len(returns) - horizon + 1, step))
+    if not origins:
+        raise ValueError("Not enough history for one walk-forward origin")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(returns,)) as executor:
+        frames = list(executor.map(_forecast_origin, origins, [model] * len(origins), [train] * len(origins),
+                                   [horizon] * len(origins), [model_kwargs] * len(origins)))
+    return pd.concat(frames, ignore_index=True).set_index(['Origin', 'Ticker'])
+
+
+def forecast_errors(results: pd.DataFrame) -> pd.DataFrame:
+    # Per-ticker RMSE in vol points and QLIKE on variances (lower is better for both)
+    forecast_var, realized_var = results['Forecast'] ** 2, results['Realized'] ** 2
+    scored = pd.DataFrame({
+        'SquaredError': (results['Forecast'] - results['Realized']) ** 2,
+        'QLIKE': realized_var / forecast_var - np.log(realized_var / forecast_var) - 1,
+    }).replace([np.inf, -np.inf], np.nan)
+    summary = scored.groupby(level='Ticker').mean()
+    summary['RMSE'] = np.sqrt(summary.pop('SquaredError'))
+    summary['Origins'] = results.groupby(level='Ticker').size()
+    return summary
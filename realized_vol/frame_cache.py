@@ -0,0 +1,84 @@
+import os
+import re
+import hashlib
+import tempfile
+import threading
+import pandas as pd
+import pyarrow as pa
+from collections import OrderedDict
+from typing import Optional
+from realized_vol.config import FRAME_CACHE_DIR, FRAME_CACHE_MAX_BYTES
+from realized_vol.price_store import SUFFIX, evict_lru
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    digest = hashlib.md5()
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# Keeps whole frames on the server and hands callbacks a short fingerprint instead.
+# Recent frames stay in process memory; every frame is also written as an Arrow file
+# so other Dash workers sharing the cache dir can memory-map it instead of refetching.
+class FrameCache:
+    def __init__(self, cache_dir: str = None, max_bytes: int = FRAME_CACHE_MAX_BYTES, memory_items: int = 8):
+        self.cache_dir = cache_dir or FRAME_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, handle: str) -> str:
+        return os.path.join(self.cache_dir, handle + SUFFIX)
+
+    def _remember(self, handle: str, df: pd.DataFrame):
+        with self._lock:
+            self._memory[handle] = df
+            self._memory.move_to_end(handle)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def put(self, df: pd.DataFrame) -> str:
+        handle = fingerprint(df)
+        self._remember(handle, df)
+
+        path = self._path(handle)
+        if os.path.exists(path):
+            os.utime(path)
+            return handle
+
+        table = pa.Table.from_pandas(df)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return handle
+
+        evict_lru(self.cache_dir, self.max_bytes, keep=path)
+        return handle
+
+    def get(self, handle: str) -> Optional[pd.DataFrame]:
+        # Handles come back from the browser, so only accept well-formed fingerprints
+        if not isinstance(handle, str) or not re.fullmatch(r'[0-9a-f]{32}', handle):
+            return None
+
+        with self._lock:
+            if handle in self._memory:
+                self._memory.move_to_end(handle)
+                return self._memory[handle]
+
+        path = self._path(handle)
+        try:
+            df = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all().to_pandas()
+            os.utime(path)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+
+        self._remember(handle, df)
+        return df
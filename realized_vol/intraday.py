@@ -0,0 +1,181 @@
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from typing import Iterator, Tuple
+from realized_vol.config import TRADING_DAYS_PER_YEAR
+from realized_vol import kernels
+
+INTRADAY_VOL_TYPES = ('Intraday Realized VOL', 'Bipower VOL', 'Realized Kernel VOL')
+MEASURE_COLUMNS = ['RV', 'BV', 'RK', 'Bars']
+TIMESTAMP_COLUMNS = ('Timestamp', 'Datetime', 'timestamp', 'datetime', 'Date', 'time')
+PRICE_COLUMNS = ('Price', 'Close', 'price', 'close', 'Last')
+TICKER_COLUMNS = ('Ticker', 'Symbol', 'ticker', 'symbol')
+
+
+def parzen(x: np.ndarray) -> np.ndarray:
+    x = np.abs(x)
+    return np.where(x <= 0.5, 1 - 6 * x ** 2 + 6 * x ** 3, np.where(x <= 1, 2 * (1 - x) ** 3, 0.0))
+
+
+def realized_measures(prices: np.ndarray, bandwidth: int = None) -> Tuple[float, float, float]:
+    # Realized variance, bipower variation and a Parzen realized kernel from one day's bars
+    returns = np.diff(np.log(prices))
+    n = len(returns)
+    if n == 0:
+        return np.nan, np.nan, np.nan
+
+    rv = float(returns @ returns)
+    bv = float(np.pi / 2 * np.abs(returns[1:]) @ np.abs(returns[:-1])) if n > 1 else np.nan
+
+    # Bandwidth rule of Barndorff-Nielsen et al. with a noise-to-signal ratio of 0.0025
+    H = bandwidth or int(np.ceil(3.5134 * 0.0025 ** 0.4 * n ** 0.6))
+    H = min(H, n - 1)
+    rk = rv
+    for h in range(1, H + 1):
+        rk += 2 * parzen((h - 1) / H) * float(returns[h:] @ returns[:-h])
+    return rv, bv, max(rk, 0.0)
+
+
+def _pick(columns, candidates, given, what):
+    if given is not None:
+        return given
+    for name in candidates:
+        if name in columns:
+            return name
+    if what == 'ticker':
+        return None
+    raise ValueError(f"No {what} column found; pass it explicitly")
+
+
+# Streams tick or minute files of any size: chunks are resampled to `interval` last-price
+# bars as they arrive, and each (ticker, day) is reduced to its realized measures as soon
+# as the next day starts. Memory holds one chunk plus one day of bars per ticker. Files
+# must be in time order per ticker.
+class IntradayVolPipeline:
+    def __init__(self, interval: str = '5min', chunksize: int = 1_000_000, bandwidth: int = None,
+                 timestamp_col: str = None, price_col: str = None, ticker_col: str = None):
+        self.interval = interval
+        self.chunksize = chunksize
+        self.bandwidth = bandwidth
+        self.timestamp_col = timestamp_col
+        self.price_col = price_col
+        self.ticker_col = ticker_col
+
+    def iter_chunks(self, path: str) -> Iterator[pd.DataFrame]:
+        if path.endswith('.parquet'):
+            parquet = pq.ParquetFile(path)
+            names = parquet.schema_arrow.names
+            columns = self._columns(names)
+            for batch in parquet.iter_batches(batch_size=self.chunksize, columns=[c for c in columns if c]):
+                yield self._standardize(batch.to_pandas(), columns)
+        else:
+            header = pd.read_csv(path, nrows=0).columns
+            columns = self._columns(header)
+            for chunk in pd.read_csv(path, chunksize=self.chunksize, usecols=[c for c in columns if c]):
+                yield self._standardize(chunk, columns)
+
+    def _columns(self, names) -> tuple:
+        return (_pick(names, TIMESTAMP_COLUMNS, self.timestamp_col, 'timestamp'),
+                _pick(names, PRICE_COLUMNS, self.price_col, 'price'),
+                _pick(names, TICKER_COLUMNS, self.ticker_col, 'ticker'))
+
+    @staticmethod
+    def _standardize(chunk: pd.DataFrame, columns: tuple) -> pd.DataFrame:
+        timestamp, price, ticker = columns
+        return pd.DataFrame({
+            'Ticker': chunk[ticker].astype(str).to_numpy() if ticker else '',
+            'Timestamp': pd.to_datetime(chunk[timestamp]).to_numpy(),
+            'Price': chunk[price].to_numpy(dtype=np.float64),
+        })
+
+    def iter_bars(self, path: str) -> Iterator[pd.DataFrame]:
+        # Last price per (ticker, interval). The final bucket of each chunk may continue in
+        # the next one, so it is held back until a later bucket for that ticker shows up.
+        pending = {}
+        for chunk in self.iter_chunks(path):
+            chunk = chunk[np.isfinite(chunk['Price']) & (chunk['Price'] > 0)]
+            chunk = chunk.assign(Timestamp=chunk['Timestamp'].dt.floor(self.interval))
+            bars = chunk.groupby(['Ticker', 'Timestamp'], sort=True)['Price'].last().reset_index()
+
+            out = []
+            for ticker, group in bars.groupby('Ticker', sort=False):
+                held = pending.pop(ticker, None)
+                if held is not None and held['Timestamp'] < group['Timestamp'].iloc[0]:
+                    out.append(held.to_frame().T)
+                pending[ticker] = group.iloc[-1]
+                if len(group) > 1:
+                    out.append(group.iloc[:-1])
+            if out:
+                yield pd.concat(out, ignore_index=True).astype({'Price': np.float64})
+        if pending:
+            yield pd.DataFrame(list(pending.values())).reset_index(drop=True).astype({'Price': np.float64})
+
+    def iter_days(self, path: str) -> Iterator[tuple]:
+        # (ticker, date, rv, bv, rk, bars) per completed day; overnight gaps are never a return
+        days = {}
+        for bars in self.iter_bars(path):
+            bars = bars.assign(Day=pd.to_datetime(bars['Timestamp']).dt.normalize())
+            for (ticker, day), group in bars.groupby(['Ticker', 'Day'], sort=True):
+                current = days.get(ticker)
+                if current is not None and day != current[0]:
+                    if day < current[0]:
+                        raise ValueError(f"{ticker} bars are out of time order at {day:%Y-%m-%d}")
+                    yield self._finish(ticker, *current)
+                    current = None
+                if current is None:
+                    current = days[ticker] = (day, [])
+                current[1].append(group['Price'].to_numpy())
+        for ticker, current in days.items():
+            yield self._finish(ticker, *current)
+
+    def _finish(self, ticker: str, day: pd.Timestamp, prices: list) -> tuple:
+        prices = np.concatenate(prices)
+        return (ticker, day, *realized_measures(prices, self.bandwidth), len(prices))
+
+    def daily_measures(self, path: str) -> pd.DataFrame:
+        rows = list(self.iter_days(path))
+        measures = pd.DataFrame(rows, columns=['Ticker', 'Date', *MEASURE_COLUMNS])
+        return measures.set_index(['Date', 'Ticker']).sort_index()
+
+
+def to_volatility(measures: pd.DataFrame, window: int = 1, annualized: bool = True) -> pd.DataFrame:
+    # Same tidy (Date, Ticker) x estimator layout as PanelVolEngine.calculate_all_volatility_types;
+    # each vol is the root of the mean daily variance over the trailing `window` days
+    scale = TRADING_DAYS_PER_YEAR if annualized else 1
+    columns = {}
+    for vol_type, measure in zip(INTRADAY_VOL_TYPES, ('RV', 'BV', 'RK')):
+        panel = measures[measure].unstack('Ticker')
+        mean = kernels.rolling_mean(panel.to_numpy(dtype=np.float64), window) if window > 1 else panel.to_numpy()
+        columns[vol_type] = pd.DataFrame(np.sqrt(scale * mean), index=panel.index, columns=panel.columns).stack(
+            future_stack=True)
+    return pd.DataFrame(columns).reindex(measures.index)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Daily realized measures from intraday tick or minute-bar files.")
+    parser.add_argument('path', help="CSV or Parquet file with timestamp, price and optional ticker columns")
+    parser.add_argument('--interval', default='5min', help="Resampling interval, e.g. 1min or 5min")
+    parser.add_argument('--window', type=int, default=1, help="Days averaged into each vol estimate")
+    parser.add_argument('--chunksize', type=int, default=1_000_000)
+    parser.add_argument('--bandwidth', type=int, default=None, help="Realized kernel bandwidth (default: automatic)")
+    parser.add_argument('--ticker', default=None, help="Ticker name when the file has no ticker column")
+    parser.add_argument('--output', default=None, help="Parquet file for the daily measures and vols")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pipeline = IntradayVolPipeline(interval=args.interval, chunksize=args.chunksize, bandwidth=args.bandwidth)
+    measures = pipeline.daily_measures(args.path)
+    if args.ticker:
+        measures = measures.rename(index={'': args.ticker}, level='Ticker')
+    result = measures.join(to_volatility(measures, args.window))
+    print(result.tail(10))
+    if args.output:
+        result.reset_index().to_parquet(args.output, index=False)
+        print(f"Wrote {len(result)} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import numpy as np
+from scipy.signal import lfilter
+
+
+def fill_gaps(values: np.ndarray) -> np.ndarray:
+    # Column-wise ffill followed by bfill on 1-D or 2-D (rows = dates) arrays. Float
+    # input keeps its dtype, and gap-free input comes back as is, without a copy.
+    values = np.asarray(values)
+    if values.dtype.kind != 'f':
+        values = values.astype(np.float64)
+    if not np.isnan(values).any():
+        return values
+    flat = values.ndim == 1
+    if flat:
+        values = values[:, None]
+
+    n_rows, n_cols = values.shape
+    cols = np.arange(n_cols)
+    valid = ~np.isnan(values)
+
+    last_valid = np.where(valid, np.arange(n_rows)[:, None], 0)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    filled = values[last_valid, cols]
+
+    first_valid = valid.argmax(axis=0)
+    filled = np.where(np.isnan(filled), values[first_valid, cols], filled)
+    return filled[:, 0] if flat else filled
+
+
+def log_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    # Always in float64, so float32 price panels lose nothing in the returns
+    return np.log(np.divide(numerator, denominator, dtype=np.float64))
+
+
+def log_returns(close: np.ndarray) -> np.ndarray:
+    returns = np.full(close.shape, np.nan)
+    returns[1:] = log_ratio(close[1:], close[:-1])
+    return returns
+
+
+def prefix_sums(values: np.ndarray):
+    # Running sum of the valid observations and running count of them; NaN contributes 0
+    valid = ~np.isnan(values)
+    return np.cumsum(np.where(valid, values, 0.0), axis=0), np.cumsum(valid, axis=0)
+
+
+def window_sums(csum: np.ndarray, ccount: np.ndarray, window: int) -> np.ndarray:
+    # Sum over each full trailing window, NaN wherever the window holds a missing value.
+    # Prefix sums are window-independent, so one pass serves any number of windows.
+    sums, counts = csum.copy(), ccount.copy()
+    sums[window:] -= csum[:-window]
+    counts[window:] -= ccount[:-window]
+    return np.where(counts == window, sums, np.nan)
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    return window_sums(*prefix_sums(values), window)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return rolling_sum(values, window) / window
+
+
+def std_from_sums(sums, sums_sq, window: int):
+    var = (sums_sq - sums * sums / window) / (window - 1)
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    return std_from_sums(rolling_sum(values, window), rolling_sum(values * values, window), window)
+
+
+def parkinson_term(log_hl: np.ndarray) -> np.ndarray:
+    return (1.0 / (4.0 * np.log(2.0))) * log_hl ** 2.0
+
+
+def garman_klass_term(log_hl: np.ndarray, log_co: np.ndarray) -> np.ndarray:
+    return 0.5 * log_hl ** 2 - (2 * np.log(2) - 1) * log_co ** 2
+
+
+def hodges_tompkins_factor(n_returns, window: int):
+    h = window
+    n = (np.asarray(n_returns, dtype=np.float64) - h) + 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 1.0 / (1.0 - (h / n) + ((h**2 - 1) / (3 * n ** 2)))
+
+
+def ewma_variance(returns: np.ndarray, decay: float, seed_window: int) -> np.ndarray:
+    # RiskMetrics recursion var_t = decay * var_{t-1} + (1 - decay) * r_t^2 down the rows,
+    # seeded with the mean square of each column's first seed_window observed returns.
+    # A missing return leaves the variance where it was rather than pulling it to zero.
+    values = np.asarray(returns, dtype=np.float64)
+    flat = values.ndim == 1
+    if flat:
+        values = values[:, None]
+
+    squared = values * values
+    missing = np.isnan(squared)
+    first = ~missing & (np.cumsum(~missing, axis=0) <= seed_window)
+    with np.errstate(invalid='ignore'):
+        seed = np.where(first, squared, 0.0).sum(axis=0) / first.sum(axis=0)
+    # Leading rows with no returns at all (the first bar) just hold the seed
+    lead = int(np.argmin(missing.all(axis=1))) if not missing.all() else len(squared)
+    var = np.empty_like(squared)
+    var[:lead] = seed
+    if missing[lead:].any():
+        previous = seed
+        for t in range(lead, len(squared)):
+            previous = np.where(missing[t], previous, decay * previous + (1 - decay) * squared[t])
+            var[t] = previous
+    else:
+        var[lead:], _ = lfilter([1 - decay], [1, -decay], squared[lead:], axis=0, zi=(decay * seed)[None, :])
+    return var[:, 0] if flat else var
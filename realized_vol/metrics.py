@@ -0,0 +1,156 @@
+import os
+import re
+import time
+import json
+import pstats
+import cProfile
+import threading
+from functools import wraps
+from contextlib import contextmanager
+from realized_vol.config import PROFILE_DIR
+
+
+class Timer:
+    __slots__ = ('count', 'errors', 'total', 'min', 'max', 'last')
+
+    def __init__(self):
+        self.count = self.errors = 0
+        self.total = self.max = self.last = 0.0
+        self.min = float('inf')
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_s': self.total,
+            'mean_s': self.total / self.count if self.count else 0.0,
+            'min_s': self.min if self.count else 0.0,
+            'max_s': self.max,
+            'last_s': self.last,
+        }
+
+
+# Process-wide counters and timers. Everything is kept as running aggregates, so
+# recording is a lock and a few additions however long the app runs.
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timers = {}
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float, error: bool = False):
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = Timer()
+            timer.observe(seconds)
+            if error:
+                timer.errors += 1
+
+    @contextmanager
+    def timer(self, name: str):
+        started = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - started, error)
+
+    def timed(self, name: str = None):
+        # Decorator form of timer(); the name defaults to the function's qualified name
+        def decorate(func):
+            metric = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(metric):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'timers': {name: timer.as_dict() for name, timer in self._timers.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = _metric_name(name)
+            lines += [f"# TYPE {metric}_total counter", f"{metric}_total {value}"]
+        for name, timer in sorted(snapshot['timers'].items()):
+            # A summary only carries _count and _sum; max and errors are families of their own
+            metric = _metric_name(name)
+            lines += [f"# TYPE {metric}_seconds summary",
+                      f"{metric}_seconds_count {timer['count']}",
+                      f"{metric}_seconds_sum {timer['total_s']:.9f}",
+                      f"# TYPE {metric}_seconds_max gauge",
+                      f"{metric}_seconds_max {timer['max_s']:.9f}",
+                      f"# TYPE {metric}_errors_total counter",
+                      f"{metric}_errors_total {timer['errors']}"]
+        return '\n'.join(lines) + '\n'
+
+
+def _metric_name(name: str) -> str:
+    return 'vol_' + re.sub(r'[^a-zA-Z0-9_]', '_', name).lower()
+
+
+registry = MetricsRegistry()
+increment = registry.increment
+observe = registry.observe
+timer = registry.timer
+timed = registry.timed
+
+
+def install(server, profile_dir: str = PROFILE_DIR):
+    # Adds GET /metrics (Prometheus text, or JSON with ?format=json) to a Flask server, and
+    # when profile_dir is set, dumps a cProfile of every request into it
+    from flask import Response, request, g
+
+    @server.route('/metrics')
+    def metrics():
+        if request.args.get('format') == 'json':
+            return Response(json.dumps(registry.snapshot(), indent=2), mimetype='application/json')
+        return Response(registry.to_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    if not profile_dir:
+        return
+    os.makedirs(profile_dir, exist_ok=True)
+
+    @server.before_request
+    def start_profile():
+        if request.path != '/metrics':
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @server.after_request
+    def stop_profile(response):
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            slug = re.sub(r'[^a-zA-Z0-9]+', '-', request.path).strip('-') or 'root'
+            path = os.path.join(profile_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10**9:09d}-{slug}.prof")
+            pstats.Stats(profiler).dump_stats(path)
+        return response
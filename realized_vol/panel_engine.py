@@ -0,0 +1,155 @@
+import warnings
+import numpy as np
+import pandas as pd
+from functools import cached_property
+from realized_vol.config import TRADING_DAYS_PER_YEAR
+from realized_vol import kernels
+from realized_vol.price_panel import PricePanel, as_field_ticker_columns
+
+VOL_TYPES = ('Realized VOL', 'Parkinson VOL', 'Garman-Klass VOL', 'Hodges-Tompkins VOL')
+CONE_PERCENTILES = (0, 10, 25, 50, 75, 90, 100)
+
+
+class PanelVolEngine:
+    def __init__(self, price_panel, window: int = 21, annualized: bool = True, dtype=np.float64):
+        # A DataFrame is wrapped without copying; only the fields an estimator reads get loaded
+        if isinstance(price_panel, PricePanel):
+            prices = price_panel
+        else:
+            prices = PricePanel.from_frame(as_field_ticker_columns(price_panel), dtype=dtype)
+        self._setup(prices, window, annualized)
+
+    def _setup(self, prices: PricePanel, window: int, annualized: bool):
+        self.prices = prices
+        self.index = prices.index
+        self.tickers = prices.tickers
+        self.window = window
+        self.annualized = annualized
+        self._prefixes = {}
+
+    @classmethod
+    def from_arrays(cls, index: pd.Index, tickers: list, fields: dict, window: int = 21,
+                    annualized: bool = True) -> 'PanelVolEngine':
+        # Builds straight from (date x ticker) arrays, e.g. views into shared memory
+        return cls(PricePanel.from_arrays(index, list(tickers), fields), window, annualized)
+
+    def _field(self, name: str) -> np.ndarray:
+        return self.prices.field(name)
+
+    @property
+    def close(self) -> pd.DataFrame:
+        return self._frame(self._field('Close'))
+
+    def _frame(self, values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=self.index, columns=self.tickers)
+
+    @cached_property
+    def log_returns(self) -> np.ndarray:
+        return kernels.log_returns(self._field('Close'))
+
+    @cached_property
+    def log_hl(self) -> np.ndarray:
+        return kernels.log_ratio(self._field('High'), self._field('Low'))
+
+    @cached_property
+    def log_co(self) -> np.ndarray:
+        return kernels.log_ratio(self._field('Close'), self._field('Open'))
+
+    def _prefix(self, term: str):
+        # Prefix sums of each per-bar term are built once and shared by every window
+        if term not in self._prefixes:
+            if term == 'returns':
+                values = self.log_returns
+            elif term == 'returns_sq':
+                values = self.log_returns * self.log_returns
+            elif term == 'parkinson':
+                values = kernels.parkinson_term(self.log_hl)
+            else:
+                values = kernels.garman_klass_term(self.log_hl, self.log_co)
+            self._prefixes[term] = kernels.prefix_sums(values)
+        return self._prefixes[term]
+
+    def _window_sum(self, term: str, window: int) -> np.ndarray:
+        return kernels.window_sums(*self._prefix(term), window)
+
+    def _return_std(self, window: int) -> np.ndarray:
+        return kernels.std_from_sums(self._window_sum('returns', window), self._window_sum('returns_sq', window), window)
+
+    def _raw_vol(self, vol_type: str, window: int) -> np.ndarray:
+        # Un-filled estimator values; NaN until the first full window
+        if vol_type == 'Realized VOL':
+            vol = self._return_std(window)
+            if self.annualized:
+                vol *= np.sqrt(TRADING_DAYS_PER_YEAR)
+            return vol
+        if vol_type == 'Parkinson VOL':
+            return np.sqrt(TRADING_DAYS_PER_YEAR * (self._window_sum('parkinson', window) / window))
+        if vol_type == 'Garman-Klass VOL':
+            return np.sqrt(TRADING_DAYS_PER_YEAR * (self._window_sum('garman_klass', window) / window))
+        if vol_type == 'Hodges-Tompkins VOL':
+            ht_vol = self._return_std(window) * np.sqrt(TRADING_DAYS_PER_YEAR)
+            n_returns = np.count_nonzero(~np.isnan(self.log_returns), axis=0)
+            return ht_vol * kernels.hodges_tompkins_factor(n_returns, window)
+        raise ValueError(f"Unknown volatility type: {vol_type}")
+
+    def _volatility(self, vol_type: str, window: int = None) -> np.ndarray:
+        return kernels.fill_gaps(self._raw_vol(vol_type, window or self.window))
+
+    def compute_realized_vol(self) -> pd.DataFrame:
+        return self.compute_volatility('Realized VOL')
+
+    def compute_parkinson_vol(self) -> pd.DataFrame:
+        return self.compute_volatility('Parkinson VOL')
+
+    def compute_garman_klass_vol(self) -> pd.DataFrame:
+        return self.compute_volatility('Garman-Klass VOL')
+
+    def compute_hodges_tompkins_vol(self) -> pd.DataFrame:
+        return self.compute_volatility('Hodges-Tompkins VOL')
+
+    def compute_ewma_vol(self, decay: float = 0.94) -> pd.DataFrame:
+        vol = np.sqrt(kernels.ewma_variance(self.log_returns, decay, self.window))
+        if self.annualized:
+            vol *= np.sqrt(TRADING_DAYS_PER_YEAR)
+        return self._frame(kernels.fill_gaps(vol))
+
+    def compute_volatility(self, vol_type: str, window: int = None) -> pd.DataFrame:
+        return self._frame(self._volatility(vol_type, window))
+
+    def _tidy_index(self) -> pd.MultiIndex:
+        return pd.MultiIndex.from_product([self.index, self.tickers], names=['Date', 'Ticker'])
+
+    def calculate_all_volatility_types(self) -> pd.DataFrame:
+        # Tidy (Date, Ticker) rows with one column per estimator
+        return pd.DataFrame(
+            {vol_type: self._volatility(vol_type).reshape(-1) for vol_type in VOL_TYPES},
+            index=self._tidy_index(),
+        )
+
+    def compute_cube(self, windows: list, vol_types: list = VOL_TYPES) -> pd.DataFrame:
+        # (Date, Ticker) rows x (Window, estimator) columns; cube[window] has the
+        # same layout as calculate_all_volatility_types for that window
+        columns = pd.MultiIndex.from_product([list(windows), list(vol_types)], names=['Window', 'Estimator'])
+        data = {
+            (window, vol_type): self._volatility(vol_type, window).reshape(-1)
+            for window in windows for vol_type in vol_types
+        }
+        return pd.DataFrame(data, index=self._tidy_index(), columns=columns)
+
+    def volatility_cone(self, windows: list, vol_types: list = VOL_TYPES,
+                        percentiles: tuple = CONE_PERCENTILES) -> pd.DataFrame:
+        # Distribution of each window's vol over history, taken from the un-filled values so
+        # the back-filled warm-up rows do not skew the low percentiles
+        blocks, keys = [], []
+        for vol_type in vol_types:
+            for window in windows:
+                raw = self._raw_vol(vol_type, window)
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    levels = np.nanpercentile(raw, percentiles, axis=0)
+                blocks.append(np.column_stack([levels.T, kernels.fill_gaps(raw)[-1]]))
+                keys.extend((ticker, vol_type, window) for ticker in self.tickers)
+
+        index = pd.MultiIndex.from_tuples(keys, names=['Ticker', 'Estimator', 'Window'])
+        columns = [f"{p}%" for p in percentiles] + ['Latest']
+        return pd.DataFrame(np.vstack(blocks), index=index, columns=columns).sort_index()
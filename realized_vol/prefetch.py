@@ -0,0 +1,156 @@
+import time
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Callable, Hashable, List, Tuple
+from realized_vol.config import PREFETCH_INTERVAL_S, PREFETCH_WATCHLIST
+from realized_vol.data_loader import MarketDataLoader
+from realized_vol.frame_cache import FrameCache
+from realized_vol.result_cache import VolResultCache
+from realized_vol.panel_engine import VOL_TYPES
+from realized_vol.price_panel import fields_for
+from realized_vol import metrics
+
+
+# Collapses concurrent calls for the same key into one: the first caller runs the
+# function and everyone arriving while it is in flight gets the same result or error
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key: Hashable, func: Callable):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            metrics.increment('prefetch.deduplicated')
+            return future.result()
+
+        try:
+            result = func()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+# Keeps dashboard requests warm from a daemon thread. Each pass refreshes the watch-list
+# and the most recently used (tickers, start, end, fields) requests: the loader only downloads
+# bars past what the price store already holds, the frame is cached by fingerprint, and
+# every estimator and cone window is computed into the result cache. Callbacks then get
+# a handle to warm data; a cold request is fetched once however many tabs ask for it.
+class PrefetchScheduler:
+    def __init__(self, loader: MarketDataLoader, frame_cache: FrameCache, result_cache: VolResultCache,
+                 watchlist: List[str] = PREFETCH_WATCHLIST, interval: float = PREFETCH_INTERVAL_S,
+                 window: int = 21, cone_windows: List[int] = (), vol_types: List[str] = VOL_TYPES,
+                 lookback_days: int = 3 * 365, max_recent: int = 20):
+        self.loader = loader
+        self.frame_cache = frame_cache
+        self.result_cache = result_cache
+        self.watchlist = list(watchlist)
+        self.interval = interval
+        self.window = window
+        self.cone_windows = list(cone_windows)
+        self.vol_types = list(vol_types)
+        self.fields = fields_for(self.vol_types, extra=('Close',))
+        self.lookback_days = lookback_days
+        self.max_recent = max_recent
+
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._recent = OrderedDict()
+        self._warm = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def key(tickers: List[str], start: str, end: str, fields: Tuple[str, ...]) -> Tuple:
+        return tuple(tickers), start, end, tuple(fields)
+
+    def _watchlist_key(self) -> Tuple:
+        end = datetime.now()
+        start = end - timedelta(days=self.lookback_days)
+        return self.key(self.watchlist, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'), self.fields)
+
+    def _touch(self, key: Tuple):
+        with self._lock:
+            self._recent[key] = None
+            self._recent.move_to_end(key)
+            while len(self._recent) > self.max_recent:
+                stale, _ = self._recent.popitem(last=False)
+                self._warm.pop(stale, None)
+
+    def _refresh(self, key: Tuple) -> str:
+        tickers, start, end, fields = key
+        # Only the estimators the requested fields can feed are warmed
+        vol_types = [v for v in self.vol_types if set(fields_for([v])) <= set(fields)]
+        with metrics.timer('prefetch.refresh'):
+            df = self.loader.fetch_price_series(tickers, start, end, fields=fields)
+            handle = self.frame_cache.put(df)
+            self.result_cache.get_volatilities(handle, df, self.window, vol_types, cone_windows=self.cone_windows)
+        with self._lock:
+            self._warm[key] = (handle, time.monotonic())
+        return handle
+
+    def _find_warm(self, key: Tuple):
+        # A fresh frame for the same request holding at least the requested fields;
+        # two intervals of slack, as the next background pass may still be running
+        tickers, start, end, fields = key
+        now = time.monotonic()
+        with self._lock:
+            for warm_key, (handle, refreshed) in self._warm.items():
+                if (warm_key[:3] == (tickers, start, end) and set(fields) <= set(warm_key[3])
+                        and now - refreshed < 2 * self.interval):
+                    return warm_key, handle
+        return None
+
+    def get(self, tickers: List[str], start: str, end: str, fields: Tuple[str, ...] = None) -> str:
+        # Handle of a warm frame for the request; only fetches if the background pass has not
+        key = self.key(tickers, start, end, fields or self.fields)
+        warm = self._find_warm(key)
+        if warm is not None:
+            # Keep the wider frame refreshed rather than adding a narrower copy of it
+            self._touch(warm[0])
+            metrics.increment('prefetch.warm_hits')
+            return warm[1]
+        self._touch(key)
+        metrics.increment('prefetch.cold_requests')
+        return self._flight.do(key, lambda: self._refresh(key))
+
+    def run_once(self):
+        with self._lock:
+            keys = list(dict.fromkeys([self._watchlist_key()] if self.watchlist else []))
+            keys += [key for key in reversed(self._recent) if key not in keys]
+        for key in keys:
+            if self._stop.is_set():
+                return
+            try:
+                self._flight.do(key, lambda: self._refresh(key))
+            except Exception:
+                metrics.increment('prefetch.errors')
+                print(f"Prefetch of {key[0]} failed:\n{traceback.format_exc()}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='vol-prefetch', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
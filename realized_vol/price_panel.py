@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterable, List
+from realized_vol import kernels
+
+FIELDS = ('Open', 'High', 'Low', 'Close')
+
+# Price fields each estimator actually reads
+ESTIMATOR_FIELDS = {
+    'Realized VOL': ('Close',),
+    'Hodges-Tompkins VOL': ('Close',),
+    'EWMA VOL': ('Close',),
+    'Parkinson VOL': ('High', 'Low'),
+    'Garman-Klass VOL': ('Open', 'High', 'Low', 'Close'),
+}
+
+
+def fields_for(vol_types: Iterable[str], extra: Iterable[str] = ()) -> tuple:
+    # In FIELDS order; extra adds fields needed besides the estimators, e.g. Close for plotting
+    needed = {*extra, *(field for vol_type in vol_types for field in ESTIMATOR_FIELDS[vol_type])}
+    return tuple(field for field in FIELDS if field in needed)
+
+
+def as_field_ticker_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # JSON round trips through dcc.Store turn the yfinance MultiIndex into plain tuples
+    if not isinstance(df.columns, pd.MultiIndex):
+        if not all(isinstance(col, (tuple, list)) for col in df.columns):
+            raise ValueError("Panel frame needs (field, ticker) columns")
+        df = df.copy(deep=False)
+        df.columns = pd.MultiIndex.from_tuples([tuple(col) for col in df.columns])
+    return df
+
+
+# (date x ticker) price arrays, one per field, pulled from their source only when an
+# estimator first asks and gap-filled (ffill then bfill) exactly once at that point.
+# Fields nobody asks for are never materialised, and float32 halves what is kept.
+class PricePanel:
+    def __init__(self, index: pd.Index, tickers: list, sources: Dict[str, Callable[[], np.ndarray]],
+                 dtype=np.float64):
+        self.index = index
+        self.tickers = list(tickers)
+        self.dtype = np.dtype(dtype)
+        self._sources = dict(sources)
+        self._arrays = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, fields: Iterable[str] = None, dtype=np.float64) -> 'PricePanel':
+        # Accepts the loader's (Price, Ticker) layout or a flat single-ticker OHLC frame;
+        # nothing is copied until a field is used
+        if isinstance(df.columns, pd.MultiIndex) or (len(df.columns) and isinstance(df.columns[0], tuple)):
+            df = as_field_ticker_columns(df)
+            available = list(df.columns.get_level_values(0).unique())
+            tickers = list(df.columns.get_level_values(1).unique())
+
+            def source(name):
+                block = df[name]
+                if list(block.columns) != tickers:
+                    block = block.reindex(columns=tickers)
+                return block.to_numpy()
+        else:
+            available = list(df.columns)
+            tickers = [None]
+
+            def source(name):
+                return df[name].to_numpy()[:, None]
+
+        fields = [f for f in (fields or available) if f in available]
+        return cls(df.index, tickers, {f: (lambda f=f: source(f)) for f in fields}, dtype)
+
+    @classmethod
+    def from_arrays(cls, index: pd.Index, tickers: list, arrays: Dict[str, np.ndarray], dtype=np.float64) -> 'PricePanel':
+        # Wraps existing (date x ticker) arrays, e.g. views into shared memory
+        return cls(index, tickers, {name: (lambda values=values: values) for name, values in arrays.items()}, dtype)
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._sources)
+
+    @property
+    def loaded(self) -> List[str]:
+        return list(self._arrays)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in self._arrays.values())
+
+    def field(self, name: str) -> np.ndarray:
+        values = self._arrays.get(name)
+        if values is None:
+            if name not in self._sources:
+                raise KeyError(f"Price panel has no {name} field")
+            raw = self._sources[name]()
+            if raw.dtype != self.dtype:
+                raw = raw.astype(self.dtype)
+            values = self._arrays[name] = kernels.fill_gaps(raw)
+        return values
+
+    def frame(self, name: str) -> pd.DataFrame:
+        return pd.DataFrame(self.field(name), index=self.index, columns=self.tickers)
+
+    def release(self, *names: str):
+        # Drops filled arrays (all of them by default); they reload from the source on next use
+        for name in names or list(self._arrays):
+            self._arrays.pop(name, None)
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from typing import Optional, Tuple
+from realized_vol.config import PRICE_CACHE_DIR, PRICE_CACHE_MAX_BYTES
+
+SUFFIX = '.arrow'
+
+
+def as_day(value) -> pd.Timestamp:
+    return pd.Timestamp(value).normalize()
+
+
+def clip_dates(frame: pd.DataFrame, start, end) -> pd.DataFrame:
+    # Half-open [start, end) to match yfinance's exclusive end date
+    start, end = as_day(start), as_day(end)
+    if getattr(frame.index, 'tz', None) is not None:
+        start, end = start.tz_localize(frame.index.tz), end.tz_localize(frame.index.tz)
+    if frame.index.is_monotonic_increasing:
+        # A positional slice stays a view of the columns
+        return frame.iloc[frame.index.searchsorted(start):frame.index.searchsorted(end)]
+    return frame[(frame.index >= start) & (frame.index < end)]
+
+
+def cache_entries(directory: str, suffix: str = SUFFIX):
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(suffix):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+
+def evict_lru(directory: str, max_bytes: int, suffix: str = SUFFIX, keep: str = None):
+    # Oldest mtime goes first; readers touch files so mtime tracks last use
+    entries = sorted(cache_entries(directory, suffix))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+# One uncompressed Arrow IPC file per ticker, so reads are memory-mapped rather than parsed.
+# The requested [start, end) range a file covers is kept in its schema metadata, and the
+# file mtime doubles as the LRU clock so several worker processes share one eviction order.
+class PriceStore:
+    def __init__(self, cache_dir: str = None, max_bytes: int = PRICE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir or PRICE_CACHE_DIR
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, ticker: str) -> str:
+        safe = ticker.replace(os.sep, '_').replace('/', '_').replace(':', '_')
+        return os.path.join(self.cache_dir, safe + SUFFIX)
+
+    def coverage(self, ticker: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        try:
+            with pa.memory_map(self._path(ticker), 'r') as source:
+                metadata = pa.ipc.open_file(source).schema.metadata or {}
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        if b'start' not in metadata or b'end' not in metadata:
+            return None
+        return as_day(metadata[b'start'].decode()), as_day(metadata[b'end'].decode())
+
+    def covers(self, ticker: str, start, end) -> bool:
+        held = self.coverage(ticker)
+        return held is not None and held[0] <= as_day(start) and as_day(end) <= held[1]
+
+    def read(self, ticker: str, start=None, end=None, fields: tuple = None) -> Optional[pd.DataFrame]:
+        path = self._path(ticker)
+        try:
+            table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        # One block per column keeps single-chunk, null-free float columns as NumPy views over
+        # the mapped file; building the frame from a dict would consolidate them into a copy
+        columns = [name for name in table.column_names if name != 'Date' and (fields is None or name in fields)]
+        frame = table.select(columns).to_pandas(split_blocks=True)
+        frame.index = pd.DatetimeIndex(table.column('Date').to_pandas(), name='Date')
+        frame.columns.name = 'Price'
+
+        if start is not None and end is not None:
+            frame = clip_dates(frame, start, end)
+        return frame
+
+    def write(self, ticker: str, frame: pd.DataFrame, start, end):
+        arrays = {'Date': pa.array(frame.index.to_numpy())}
+        for column in frame.columns:
+            arrays[str(column)] = pa.array(frame[column].to_numpy(dtype=np.float64))
+
+        metadata = {'start': as_day(start).strftime('%Y-%m-%d'), 'end': as_day(end).strftime('%Y-%m-%d')}
+        table = pa.table(arrays).replace_schema_metadata(metadata)
+
+        path = self._path(ticker)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, path)
+        except OSError:
+            # A reader on a platform that locks mapped files still holds the old copy
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._evict(keep=path)
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in cache_entries(self.cache_dir))
+
+    def _evict(self, keep: str = None):
+        evict_lru(self.cache_dir, self.max_bytes, keep=keep)
+
+    def clear(self):
+        for _, _, path in cache_entries(self.cache_dir):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,97 @@
+import threading
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+from realized_vol.config import VOL_RESULT_CACHE_MAX_BYTES
+from realized_vol.panel_engine import PanelVolEngine
+from realized_vol import metrics
+
+
+# Stands in for the window in the key of a cached (Window x percentile) cone frame
+CONE = 'cone'
+
+
+# LRU of per-ticker estimator series keyed by (price fingerprint, ticker, window, estimator).
+# Only estimators that are asked for and not already held get computed.
+class VolResultCache:
+    def __init__(self, max_bytes: int = VOL_RESULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable) -> Optional[pd.Series]:
+        with self._lock:
+            series = self._entries.get(key)
+            if series is not None:
+                self._entries.move_to_end(key)
+            return series
+
+    def put(self, key: Hashable, series: pd.Series):
+        size = series.to_numpy().nbytes
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key).to_numpy().nbytes
+            self._entries[key] = series
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.to_numpy().nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_volatilities(self, fingerprint: str, prices: pd.DataFrame, window: int,
+                         vol_types: List[str], cone_windows: List[int] = ()) -> Dict[str, pd.DataFrame]:
+        tickers = list(prices['Close'].columns)
+        found = {}
+        missing = []
+        for vol_type in vol_types:
+            series = [self.get((fingerprint, ticker, window, vol_type)) for ticker in tickers]
+            if any(s is None for s in series):
+                missing.append(vol_type)
+            else:
+                found[vol_type] = dict(zip(tickers, series))
+
+        self.hits += len(found)
+        self.misses += len(missing)
+        metrics.increment('result_cache.hits', len(found))
+        metrics.increment('result_cache.misses', len(missing))
+
+        if missing:
+            # One engine pass fills every cone window too, so later window changes are lookups
+            engine = PanelVolEngine(prices, window=window)
+            windows = sorted({window, *cone_windows})
+            for vol_type in missing:
+                for w in windows:
+                    with metrics.timer(f'engine.panel.{vol_type}'):
+                        panel = engine.compute_volatility(vol_type, w)
+                    for ticker in tickers:
+                        self.put((fingerprint, ticker, w, vol_type), panel[ticker])
+                    if w == window:
+                        found[vol_type] = {ticker: panel[ticker] for ticker in tickers}
+
+                if cone_windows:
+                    cone = engine.volatility_cone(list(cone_windows), [vol_type])
+                    for ticker in tickers:
+                        self.put((fingerprint, ticker, CONE, vol_type), cone.loc[(ticker, vol_type)])
+
+        # One (date x estimator) frame per ticker, in the order the estimators were asked for
+        return {
+            ticker: pd.DataFrame({vol_type: found[vol_type][ticker] for vol_type in vol_types}, index=prices.index)
+            for ticker in tickers
+        }
+
+    def get_cone(self, fingerprint: str, ticker: str, vol_type: str) -> Optional[pd.DataFrame]:
+        return self.get((fingerprint, ticker, CONE, vol_type))
@@ -0,0 +1,92 @@
+import os
+import threading
+import pandas as pd
+import yfinance as yf
+from abc import ABC, abstractmethod
+from typing import Dict, List
+from realized_vol.price_store import clip_dates
+
+
+def split_by_ticker(df: pd.DataFrame, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+    if df is None or df.empty:
+        return {}
+    if not isinstance(df.columns, pd.MultiIndex):
+        return {tickers[0]: df}
+
+    frames = {}
+    for ticker in tickers:
+        if ticker in df.columns.get_level_values(1):
+            frame = df.xs(ticker, axis=1, level=1).dropna(how='all')
+            if not frame.empty:
+                frames[ticker] = frame
+    return frames
+
+
+def assemble_panel(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    # Rebuild the (Price, Ticker) column layout that yf.download returns
+    df = pd.concat(frames, axis=1, names=['Ticker', 'Price']).swaplevel(axis=1)
+    return df.sort_index(axis=1, level=0, sort_remaining=False)
+
+
+class PriceSource(ABC):
+    # Returns daily OHLCV for [start, end) in yf.download's (Price, Ticker) layout;
+    # tickers with no data are simply absent or all-NaN
+    @abstractmethod
+    def download(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        ...
+
+
+# yf.download collects results in module-global state, so concurrent calls can drop or swap
+# each other's tickers; calls are serialized and parallelism comes from its own threads=
+_YF_LOCK = threading.Lock()
+
+
+class YahooSource(PriceSource):
+    def __init__(self, threads: bool = True):
+        self.threads = threads
+
+    def download(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        with _YF_LOCK:
+            return yf.download(tickers, start=start, end=end, progress=False, threads=self.threads)
+
+
+class LocalFileSource(PriceSource):
+    # Replays <TICKER>.parquet or <TICKER>.csv snapshots from a directory, for offline runs and benchmarks
+    EXTENSIONS = ('.parquet', '.csv')
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _read(self, ticker: str) -> pd.DataFrame:
+        for extension in self.EXTENSIONS:
+            path = os.path.join(self.directory, ticker + extension)
+            if os.path.exists(path):
+                if extension == '.parquet':
+                    frame = pd.read_parquet(path)
+                else:
+                    frame = pd.read_csv(path, index_col=0, parse_dates=True)
+                if 'Date' in frame.columns:
+                    frame = frame.set_index('Date')
+                frame.index = pd.DatetimeIndex(frame.index, name='Date')
+                return frame
+        return None
+
+    def download(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        frames = {}
+        for ticker in tickers:
+            frame = self._read(ticker)
+            if frame is not None:
+                frame = clip_dates(frame, start, end)
+                if not frame.empty:
+                    frames[ticker] = frame
+        return assemble_panel(frames) if frames else pd.DataFrame()
+
+    def save(self, df: pd.DataFrame, extension: str = '.parquet'):
+        os.makedirs(self.directory, exist_ok=True)
+        tickers = list(df.columns.get_level_values(1).unique())
+        for ticker, frame in split_by_ticker(df, tickers).items():
+            path = os.path.join(self.directory, ticker + extension)
+            if extension == '.parquet':
+                frame.to_parquet(path)
+            else:
+                frame.to_csv(path)
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+from realized_vol import kernels
+
+EVENT_COLUMNS = ['Ticker', 'Date', 'Start', 'End', 'Days', 'Vol', 'ZScore']
+
+
+# Rolling z-scores over a (date x ticker) vol panel, each day scored only against the
+# `lookback` days before it. Consecutive days above threshold collapse into one event
+# reported at its peak, ranked by z-score across the whole universe.
+class SpikeScanner:
+    def __init__(self, lookback: int = 252, threshold: float = 2.5):
+        self.lookback = lookback
+        self.threshold = threshold
+        self._tail = None
+        self._tail_z = None
+
+    def zscores(self, vol_panel: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame(self._zscores(vol_panel.to_numpy(dtype=np.float64)),
+                            index=vol_panel.index, columns=vol_panel.columns)
+
+    def _zscores(self, values: np.ndarray) -> np.ndarray:
+        mean = kernels.rolling_mean(values, self.lookback)
+        std = kernels.rolling_std(values, self.lookback)
+
+        # Shift one row so today's value is never part of its own baseline
+        prior_mean = np.full_like(mean, np.nan)
+        prior_std = np.full_like(std, np.nan)
+        prior_mean[1:], prior_std[1:] = mean[:-1], std[:-1]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = (values - prior_mean) / prior_std
+        z[~np.isfinite(z)] = np.nan
+        return z
+
+    def _events(self, index: pd.Index, tickers: list, values: np.ndarray, z: np.ndarray,
+                since: int = 0) -> pd.DataFrame:
+        above = np.nan_to_num(z, nan=-np.inf) > self.threshold
+        if not above.any():
+            return pd.DataFrame(columns=EVENT_COLUMNS)
+
+        # Label runs of consecutive exceedances per ticker
+        starts = above & ~np.vstack([np.zeros((1, above.shape[1]), dtype=bool), above[:-1]])
+        run_id = np.cumsum(starts, axis=0)
+        rows, cols = np.nonzero(above)
+
+        cells = pd.DataFrame({
+            'col': cols,
+            'run': run_id[rows, cols],
+            'row': rows,
+            'z': z[rows, cols],
+        })
+        grouped = cells.groupby(['col', 'run'], sort=False)
+        bounds = grouped['row'].agg(['min', 'max', 'size'])
+        peaks = cells.loc[grouped['z'].idxmax().to_numpy()]
+        peak_rows, peak_cols = peaks['row'].to_numpy(), peaks['col'].to_numpy()
+
+        events = pd.DataFrame({
+            'Ticker': np.asarray(tickers, dtype=object)[peak_cols],
+            'Date': index[peak_rows],
+            'Start': index[bounds['min'].to_numpy()],
+            'End': index[bounds['max'].to_numpy()],
+            'Days': bounds['size'].to_numpy(),
+            'Vol': values[peak_rows, peak_cols],
+            'ZScore': peaks['z'].to_numpy(),
+        })
+        events = events[bounds['max'].to_numpy() >= since]
+        return events.sort_values('ZScore', ascending=False, ignore_index=True)
+
+    def scan(self, vol_panel: pd.DataFrame, top: int = None) -> pd.DataFrame:
+        values = vol_panel.to_numpy(dtype=np.float64)
+        z = self._zscores(values)
+        self._tail, self._tail_z = vol_panel.iloc[-self.lookback:], z[-self.lookback:]
+
+        events = self._events(vol_panel.index, list(vol_panel.columns), values, z)
+        return events.head(top) if top else events
+
+    def update(self, new_rows: pd.DataFrame, top: int = None) -> pd.DataFrame:
+        # Scores only the new rows against the retained tail; returns events still running into them
+        if self._tail is None:
+            return self.scan(new_rows, top)
+
+        combined = pd.concat([self._tail, new_rows.reindex(columns=self._tail.columns)])
+        values = combined.to_numpy(dtype=np.float64)
+        z_new = self._zscores(values)[len(self._tail):]
+        z = np.vstack([self._tail_z, z_new])
+        self._tail, self._tail_z = combined.iloc[-self.lookback:], z[-self.lookback:]
+
+        events = self._events(combined.index, list(combined.columns), values, z, since=len(combined) - len(new_rows))
+        return events.head(top) if top else events
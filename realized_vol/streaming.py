@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Mapping
+from realized_vol.config import TRADING_DAYS_PER_YEAR
+from realized_vol.panel_engine import VOL_TYPES
+from realized_vol import kernels
+
+FIELDS = ('Open', 'High', 'Low', 'Close')
+
+# Per-bar terms carried in the running sums: r, r^2, Parkinson term, Garman-Klass term
+N_TERMS = 4
+
+
+# Single-ticker estimator state updated one bar at a time. The ring buffers hold the
+# last window + 1 prefix sums of the per-bar terms, so every window sum is formed exactly
+# as kernels.rolling_sum forms it and the latest values match the batch engine bit-for-bit.
+class StreamingVolEngine:
+    def __init__(self, window: int = 21, annualized: bool = True):
+        self.window = window
+        self.annualized = annualized
+
+        self._prefix = np.zeros(N_TERMS)
+        self._prefix_count = np.zeros(N_TERMS, dtype=np.int64)
+        self._ring = np.zeros((window + 1, N_TERMS))
+        self._ring_count = np.zeros((window + 1, N_TERMS), dtype=np.int64)
+        self._n_bars = 0
+        self._n_returns = 0
+
+        self._last_bar = None
+        self._last_values = dict.fromkeys(VOL_TYPES, np.nan)
+
+    @classmethod
+    def from_history(cls, price_series: pd.DataFrame, window: int = 21, annualized: bool = True) -> 'StreamingVolEngine':
+        engine = cls(window=window, annualized=annualized)
+        prices = price_series
+        if isinstance(prices.columns, pd.MultiIndex):
+            prices = prices.droplevel(1, axis=1)
+
+        n_bars = len(prices)
+        if n_bars == 0:
+            return engine
+        fields = {field: kernels.fill_gaps(prices[field].to_numpy(dtype=np.float64)) for field in FIELDS}
+
+        returns = kernels.log_returns(fields['Close'])
+        log_hl = kernels.log_ratio(fields['High'], fields['Low'])
+        log_co = kernels.log_ratio(fields['Close'], fields['Open'])
+        terms = np.column_stack([
+            returns,
+            returns * returns,
+            kernels.parkinson_term(log_hl),
+            kernels.garman_klass_term(log_hl, log_co),
+        ])
+        csum, ccount = kernels.prefix_sums(terms)
+
+        # Bar b's prefix sum lives in ring slot b % (window + 1)
+        tail = np.arange(max(n_bars - window - 1, 0), n_bars)
+        engine._ring[tail % (window + 1)] = csum[tail]
+        engine._ring_count[tail % (window + 1)] = ccount[tail]
+        engine._prefix = csum[-1].copy()
+        engine._prefix_count = ccount[-1].copy()
+        engine._n_bars = n_bars
+        engine._n_returns = int(ccount[-1, 0])
+        engine._last_bar = {field: fields[field][-1] for field in FIELDS}
+        engine._refresh_values()
+        return engine
+
+    def _fill_bar(self, bar: Mapping) -> Dict[str, float]:
+        filled = {}
+        for field in FIELDS:
+            value = float(bar[field]) if bar.get(field) is not None else np.nan
+            if np.isnan(value) and self._last_bar is not None:
+                value = self._last_bar[field]
+            filled[field] = value
+        return filled
+
+    def _window_sums(self):
+        sums, counts = self._prefix.copy(), self._prefix_count.copy()
+        if self._n_bars > self.window:
+            oldest = self._n_bars % (self.window + 1)
+            sums -= self._ring[oldest]
+            counts -= self._ring_count[oldest]
+        return np.where(counts == self.window, sums, np.nan)
+
+    def _refresh_values(self):
+        window = self.window
+        sums = self._window_sums()
+        std = kernels.std_from_sums(sums[0], sums[1], window)
+
+        realized = std
+        if self.annualized:
+            realized = realized * np.sqrt(TRADING_DAYS_PER_YEAR)
+
+        ht_factor = kernels.hodges_tompkins_factor(self._n_returns, window)
+        values = {
+            'Realized VOL': realized,
+            'Parkinson VOL': np.sqrt(TRADING_DAYS_PER_YEAR * (sums[2] / window)),
+            'Garman-Klass VOL': np.sqrt(TRADING_DAYS_PER_YEAR * (sums[3] / window)),
+            'Hodges-Tompkins VOL': std * np.sqrt(TRADING_DAYS_PER_YEAR) * ht_factor,
+        }
+        # Same forward fill as the batch output: keep the last defined value
+        for name, value in values.items():
+            if not np.isnan(value):
+                self._last_values[name] = float(value)
+
+    def update(self, bar: Mapping) -> Dict[str, float]:
+        filled = self._fill_bar(bar)
+        if np.isnan(filled['Close']):
+            return self.latest()
+
+        if self._last_bar is None:
+            ret = np.nan
+        else:
+            ret = kernels.log_ratio(np.array([filled['Close']]), np.array([self._last_bar['Close']]))[0]
+        log_hl = kernels.log_ratio(np.array([filled['High']]), np.array([filled['Low']]))
+        log_co = kernels.log_ratio(np.array([filled['Close']]), np.array([filled['Open']]))
+
+        terms = np.array([
+            ret,
+            ret * ret,
+            kernels.parkinson_term(log_hl)[0],
+            kernels.garman_klass_term(log_hl, log_co)[0],
+        ])
+        valid = ~np.isnan(terms)
+
+        # The slot being overwritten holds a prefix sum that has already left the window
+        slot = self._n_bars % (self.window + 1)
+        self._prefix += np.where(valid, terms, 0.0)
+        self._prefix_count += valid
+        self._ring[slot] = self._prefix
+        self._ring_count[slot] = self._prefix_count
+
+        self._n_bars += 1
+        self._n_returns += int(valid[0])
+        self._last_bar = filled
+        self._refresh_values()
+        return self.latest()
+
+    def update_batch(self, bars: pd.DataFrame) -> pd.DataFrame:
+        rows = [self.update(bar) for bar in bars.to_dict(orient='records')]
+        return pd.DataFrame(rows, index=bars.index, columns=list(VOL_TYPES))
+
+    def latest(self) -> Dict[str, float]:
+        return dict(self._last_values)
@@ -1,66 +1,89 @@
 import numpy as np
 import pandas as pd
+from functools import cached_property
 from realized_vol.config import TRADING_DAYS_PER_YEAR
+from realized_vol.price_panel import PricePanel
+from realized_vol import kernels
+from realized_vol import metrics
 
 class RealizedVolEngine:
-    def __init__(self, price_series: pd.DataFrame, window: int = 21, annualized: bool = True):
-        self.price_series = price_series.copy()
-        if isinstance(self.price_series.columns, pd.MultiIndex):
-            self.price_series.columns = self.price_series.columns.droplevel(1)
-        
-        self.price_series = self.price_series.fillna(method='ffill').fillna(method='bfill')
+    def __init__(self, price_series, window: int = 21, annualized: bool = True, dtype=np.float64):
+        # No copy of the frame: fields are pulled and gap-filled once, on first use
+        self.price_series = price_series
+        if isinstance(price_series, PricePanel):
+            self.prices = price_series
+        else:
+            self.prices = PricePanel.from_frame(price_series, dtype=dtype)
         self.window = window
         self.annualized = annualized
 
+    def _field(self, name: str) -> np.ndarray:
+        values = self.prices.field(name)
+        return values[:, 0] if values.shape[1] == 1 else values
+
+    def _wrap(self, values: np.ndarray):
+        if values.ndim == 1:
+            return pd.Series(values, index=self.prices.index, name='Close')
+        return pd.DataFrame(values, index=self.prices.index, columns=self.prices.tickers)
+
+    # Log terms are derived once and shared by every estimator
+    @cached_property
+    def log_returns(self) -> np.ndarray:
+        return kernels.log_returns(self._field('Close'))
+
+    @cached_property
+    def log_hl(self) -> np.ndarray:
+        return kernels.log_ratio(self._field('High'), self._field('Low'))
+
+    @cached_property
+    def log_co(self) -> np.ndarray:
+        return kernels.log_ratio(self._field('Close'), self._field('Open'))
+
+    @metrics.timed('engine.compute_realized_vol')
     def compute_realized_vol(self) -> pd.Series:
-        returns = (self.price_series['Close'] / self.price_series['Close'].shift(1)).apply(np.log)
-        vol = returns.rolling(window=self.window).std()
+        vol = kernels.rolling_std(self.log_returns, self.window)
 
         if self.annualized:
             vol *= np.sqrt(TRADING_DAYS_PER_YEAR)
-        
-        return vol.fillna(method='ffill').fillna(method='bfill')
-    
+
+        return self._wrap(kernels.fill_gaps(vol))
+
+    @metrics.timed('engine.compute_parkinson_vol')
     def compute_parkinson_vol(self) -> pd.Series:
-        park_vol = (1.0 / (4.0 * np.log(2.0))) * (
-            (self.price_series['High'] / self.price_series['Low']).apply(np.log)
-         ) ** 2.0 
-        
-        def f(v):
-            return (TRADING_DAYS_PER_YEAR * v.mean()) ** 0.5
-        
-        result = park_vol.rolling(window=self.window).apply(func=f)
-        return result.fillna(method='ffill').fillna(method='bfill')
-    
-    def compute_garman_klass_vol(self) -> pd.Series:
-        log_hl = (self.price_series['High'] / self.price_series['Low']).apply(np.log)
-        log_co = (self.price_series['Close'] / self.price_series['Open']).apply(np.log)
+        park_vol = kernels.parkinson_term(self.log_hl)
+        result = np.sqrt(TRADING_DAYS_PER_YEAR * kernels.rolling_mean(park_vol, self.window))
+        return self._wrap(kernels.fill_gaps(result))
 
-        gk_vol = 0.5 * log_hl ** 2 - (2 * np.log(2) - 1) * log_co ** 2
+    @metrics.timed('engine.compute_garman_klass_vol')
+    def compute_garman_klass_vol(self) -> pd.Series:
+        gk_vol = kernels.garman_klass_term(self.log_hl, self.log_co)
+        result = np.sqrt(TRADING_DAYS_PER_YEAR * kernels.rolling_mean(gk_vol, self.window))
+        return self._wrap(kernels.fill_gaps(result))
 
-        def f(v):
-            return (TRADING_DAYS_PER_YEAR * v.mean()) ** 0.5
-        
-        result = gk_vol.rolling(window=self.window).apply(func=f)
-        return result.fillna(method='ffill').fillna(method='bfill')
-    
+    @metrics.timed('engine.compute_hodges_tompkins_vol')
     def compute_hodges_tompkins_vol(self) -> pd.Series:
-        log_return = (self.price_series['Close'] / self.price_series['Close'].shift(1)).apply(np.log)
+        log_return = self.log_returns
+
+        ht_vol = kernels.rolling_std(log_return, self.window) * np.sqrt(TRADING_DAYS_PER_YEAR)
+        adj_factor = kernels.hodges_tompkins_factor(np.count_nonzero(~np.isnan(log_return), axis=0), self.window)
 
-        ht_vol = log_return.rolling(window=self.window).std() * np.sqrt(TRADING_DAYS_PER_YEAR)
+        return self._wrap(kernels.fill_gaps(ht_vol * adj_factor))
 
-        h = self.window
-        n = (log_return.count() - h) + 1
+    @metrics.timed('engine.compute_ewma_vol')
+    def compute_ewma_vol(self, decay: float = 0.94) -> pd.Series:
+        # RiskMetrics-style exponentially weighted vol, seeded over the first window
+        vol = np.sqrt(kernels.ewma_variance(self.log_returns, decay, self.window))
+
+        if self.annualized:
+            vol *= np.sqrt(TRADING_DAYS_PER_YEAR)
 
-        adj_factor = 1.0 / (1.0 - (h / n) + ((h**2 - 1) / (3 * n ** 2)))
+        return self._wrap(kernels.fill_gaps(vol))
 
-        result = ht_vol * adj_factor
-        return result.fillna(method='ffill').fillna(method='bfill')
-    
+    @metrics.timed('engine.calculate_all_volatility_types')
     def calculate_all_volatility_types(self) -> pd.DataFrame:
         return pd.DataFrame({
             'Realized VOL': self.compute_realized_vol().squeeze(),
             'Parkinson VOL': self.compute_parkinson_vol().squeeze(),
             'Garman-Klass VOL': self.compute_garman_klass_vol().squeeze(),
             'Hodges-Tompkins VOL': self.compute_hodges_tompkins_vol().squeeze(),
-        }).fillna(method='ffill').fillna(method='bfill')
+        })
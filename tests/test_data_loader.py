@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import synthetic_ohlcv
+from realized_vol.bulk_loader import BulkLoader
+from realized_vol.data_loader import MarketDataLoader
+from realized_vol.price_store import clip_dates
+from realized_vol.sources import PriceSource
+
+T = pd.Timestamp
+PRICES = synthetic_ohlcv(n_tickers=2, n_years=1, start='2020-01-02')
+A, B = PRICES.columns.get_level_values(1).unique()
+
+
+class FakeSource(PriceSource):
+    # Serves PRICES, records every call, and can be told to fail or answer empty next time
+    def __init__(self):
+        self.calls = []
+        self.fail_next = False
+        self.empty_next = False
+
+    def download(self, tickers, start, end):
+        self.calls.append((tuple(tickers), start, end))
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("rate limited")
+        if self.empty_next:
+            self.empty_next = False
+            return pd.DataFrame()
+        columns = PRICES.columns.get_level_values(1).isin(tickers)
+        return clip_dates(PRICES.loc[:, columns], start, end)
+
+
+@pytest.fixture
+def source():
+    return FakeSource()
+
+
+@pytest.fixture
+def loader(tmp_path, source):
+    return MarketDataLoader(cache_dir=str(tmp_path), source=source)
+
+
+def expected(tickers, start, end):
+    frame = clip_dates(PRICES.loc[:, PRICES.columns.get_level_values(1).isin(tickers)], start, end)
+    return frame.sort_index(axis=1, level=0, sort_remaining=False)
+
+
+def assert_frame(result, tickers, start, end):
+    np.testing.assert_array_equal(result.to_numpy(), expected(tickers, start, end)[result.columns].to_numpy())
+    assert len(result) == len(expected(tickers, start, end))
+
+
+def test_new_ticker_is_fetched_over_the_request(loader, source):
+    result = loader.fetch_price_series((A,), '2020-03-02', '2020-06-01')
+    assert source.calls == [((A,), '2020-03-02', '2020-06-01')]
+    assert_frame(result, [A], '2020-03-02', '2020-06-01')
+    assert loader.store.coverage(A) == (T('2020-03-02'), T('2020-06-01'))
+
+
+def test_repeat_request_makes_no_download(loader, source):
+    loader.fetch_price_series((A, B), '2020-03-02', '2020-06-01')
+    source.calls.clear()
+    result = loader.fetch_price_series((A, B), '2020-03-02', '2020-06-01')
+    assert source.calls == []
+    assert_frame(result, [A, B], '2020-03-02', '2020-06-01')
+
+
+def test_head_and_tail_gaps_fetch_only_the_missing_segments(loader, source):
+    loader.fetch_price_series((A,), '2020-03-02', '2020-06-01')
+    source.calls.clear()
+    result = loader.fetch_price_series((A,), '2020-02-03', '2020-07-01')
+    assert sorted(source.calls) == [((A,), '2020-02-03', '2020-03-02'), ((A,), '2020-06-01', '2020-07-01')]
+    assert_frame(result, [A], '2020-02-03', '2020-07-01')
+    assert loader.store.coverage(A) == (T('2020-02-03'), T('2020-07-01'))
+
+
+def test_tickers_missing_the_same_segment_share_a_download(loader, source):
+    loader.fetch_price_series((A,), '2020-03-02', '2020-06-01')
+    source.calls.clear()
+    loader.fetch_price_series((A, B), '2020-03-02', '2020-06-01')
+    assert source.calls == [((B,), '2020-03-02', '2020-06-01')]
+
+
+def test_empty_answer_over_sessions_is_not_recorded(loader, source):
+    loader.fetch_price_series((A,), '2020-03-02', '2020-06-01')
+    source.empty_next = True
+    loader.fetch_price_series((A,), '2020-03-02', '2020-07-01')
+    assert loader.store.coverage(A) == (T('2020-03-02'), T('2020-06-01'))
+
+    source.calls.clear()
+    result = loader.fetch_price_series((A,), '2020-03-02', '2020-07-01')
+    assert source.calls == [((A,), '2020-06-01', '2020-07-01')]
+    assert_frame(result, [A], '2020-03-02', '2020-07-01')
+
+
+def test_empty_answer_over_a_weekend_is_recorded(loader, source):
+    # Ends on a Saturday, so the next request's tail is the weekend alone
+    loader.fetch_price_series((A,), '2020-03-02', '2020-05-30')
+    source.empty_next = True
+    loader.fetch_price_series((A,), '2020-03-02', '2020-06-01')
+    assert loader.store.coverage(A) == (T('2020-03-02'), T('2020-06-01'))
+
+    source.calls.clear()
+    loader.fetch_price_series((A,), '2020-03-02', '2020-06-01')
+    assert source.calls == []
+
+
+def test_failed_answer_leaves_coverage_untouched(loader, source):
+    loader.fetch_price_series((A,), '2020-03-02', '2020-06-01')
+    source.fail_next = True
+    with pytest.raises(ConnectionError):
+        loader.fetch_price_series((A,), '2020-03-02', '2020-07-01')
+    assert loader.store.coverage(A) == (T('2020-03-02'), T('2020-06-01'))
+
+    result = loader.fetch_price_series((A,), '2020-03-02', '2020-07-01')
+    assert_frame(result, [A], '2020-03-02', '2020-07-01')
+
+
+def test_bulk_failure_is_reported_and_not_recorded(tmp_path, source):
+    loader = MarketDataLoader(cache_dir=str(tmp_path), source=source,
+                              bulk_loader=BulkLoader(source, max_retries=0, backoff=0))
+    loader.fetch_price_series((A,), '2020-03-02', '2020-06-01')
+    source.fail_next = True
+    result = loader.fetch_price_series((A,), '2020-03-02', '2020-07-01')
+    assert A in loader.failures
+    assert loader.store.coverage(A) == (T('2020-03-02'), T('2020-06-01'))
+    assert_frame(result, [A], '2020-03-02', '2020-06-01')
+
+
+def test_bulk_empty_answer_is_not_a_failure(tmp_path, source):
+    loader = MarketDataLoader(cache_dir=str(tmp_path), source=source,
+                              bulk_loader=BulkLoader(source, max_retries=0, backoff=0))
+    loader.fetch_price_series((A,), '2020-03-02', '2020-05-30')
+    loader.fetch_price_series((A,), '2020-03-02', '2020-06-01')
+    assert loader.failures == {}
+    assert loader.store.coverage(A) == (T('2020-03-02'), T('2020-06-01'))
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import synthetic_ohlcv
+from realized_vol.config import TRADING_DAYS_PER_YEAR
+from realized_vol.panel_engine import PanelVolEngine, VOL_TYPES
+from realized_vol.vol_engine import RealizedVolEngine
+
+TOLERANCE = 1e-12
+
+
+def reference_vols(prices: pd.DataFrame, window: int) -> pd.DataFrame:
+    # The original rolling().apply estimators, kept as the regression reference
+    prices = prices.ffill().bfill()
+    log_return = np.log(prices['Close'] / prices['Close'].shift(1))
+    log_hl = np.log(prices['High'] / prices['Low'])
+    log_co = np.log(prices['Close'] / prices['Open'])
+
+    def annualized_mean(v):
+        return (TRADING_DAYS_PER_YEAR * v.mean()) ** 0.5
+
+    realized = log_return.rolling(window=window).std() * np.sqrt(TRADING_DAYS_PER_YEAR)
+    parkinson = ((1.0 / (4.0 * np.log(2.0))) * log_hl ** 2.0).rolling(window=window).apply(annualized_mean)
+    garman_klass = (0.5 * log_hl ** 2 - (2 * np.log(2) - 1) * log_co ** 2).rolling(window=window).apply(annualized_mean)
+    n = (log_return.count() - window) + 1
+    hodges_tompkins = realized / (1.0 - (window / n) + ((window ** 2 - 1) / (3 * n ** 2)))
+
+    return pd.DataFrame({
+        'Realized VOL': realized,
+        'Parkinson VOL': parkinson,
+        'Garman-Klass VOL': garman_klass,
+        'Hodges-Tompkins VOL': hodges_tompkins,
+    }).ffill().bfill()
+
+
+@pytest.fixture(scope='module')
+def prices():
+    df = synthetic_ohlcv(n_tickers=3, n_years=2, seed=7)
+    tickers = df.columns.get_level_values(1)
+    # A late listing and a mid-series gap, both filled the same way by every engine
+    df.iloc[:30, tickers == 'SYN0001'] = np.nan
+    df.iloc[200:204, tickers == 'SYN0002'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('window', [5, 21, 63])
+def test_single_ticker_engine_matches_reference(prices, window):
+    for ticker in prices.columns.get_level_values(1).unique():
+        single = prices.xs(ticker, axis=1, level=1)
+        result = RealizedVolEngine(single, window=window).calculate_all_volatility_types()
+        expected = reference_vols(single, window)
+        np.testing.assert_allclose(result[list(VOL_TYPES)].to_numpy(), expected.to_numpy(), rtol=0, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize('window', [5, 21, 63])
+def test_panel_engine_matches_reference(prices, window):
+    result = PanelVolEngine(prices, window=window).calculate_all_volatility_types()
+    for ticker in prices.columns.get_level_values(1).unique():
+        expected = reference_vols(prices.xs(ticker, axis=1, level=1), window)
+        actual = result.xs(ticker, level='Ticker')[list(VOL_TYPES)]
+        np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=0, atol=TOLERANCE)
+
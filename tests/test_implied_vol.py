@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from implied_vol import black_scholes
+from implied_vol.solver import implied_volatility
+
+SPOT, RATE, DIVIDEND = 100.0, 0.03, 0.02
+
+
+def grid():
+    strike, expiry, sigma, is_call = np.meshgrid(
+        np.array([60.0, 80.0, 95.0, 100.0, 105.0, 125.0, 160.0]),
+        np.array([0.05, 0.25, 1.0, 3.0]),
+        np.array([0.05, 0.2, 0.6, 1.5]),
+        np.array([True, False]),
+        indexing='ij')
+    return strike.ravel(), expiry.ravel(), sigma.ravel(), is_call.ravel()
+
+
+def test_round_trip_calls_and_puts():
+    strike, expiry, sigma, is_call = grid()
+    prices = black_scholes.price(SPOT, strike, expiry, RATE, sigma, is_call, DIVIDEND)
+    # Deep out-of-the-money, low-vol, short-dated quotes carry no recoverable vol information
+    vega = black_scholes.vega(SPOT, strike, expiry, RATE, sigma, DIVIDEND)
+    informative = vega > 1e-6
+    assert informative.sum() > 0.8 * len(strike)
+    assert (strike[informative] < SPOT).any() and (strike[informative] > SPOT).any()
+
+    iv = implied_volatility(prices, SPOT, strike, expiry, RATE, is_call, DIVIDEND)
+    np.testing.assert_allclose(iv[informative], sigma[informative], rtol=1e-8)
+
+
+def test_round_trip_keeps_shape():
+    strike = np.array([[90.0, 100.0, 110.0], [90.0, 100.0, 110.0]])
+    is_call = np.array([[True], [False]])
+    prices = black_scholes.price(SPOT, strike, 0.5, RATE, 0.3, is_call, DIVIDEND)
+    iv = implied_volatility(prices, SPOT, strike, 0.5, RATE, is_call, DIVIDEND)
+    assert iv.shape == strike.shape
+    np.testing.assert_allclose(iv, 0.3, rtol=1e-8)
+
+
+@pytest.mark.parametrize('is_call', [True, False])
+def test_quotes_outside_no_arbitrage_bounds_are_nan(is_call):
+    strike, expiry = np.array([80.0, 100.0, 120.0]), 1.0
+    discounted_spot = SPOT * np.exp(-DIVIDEND * expiry)
+    discounted_strike = strike * np.exp(-RATE * expiry)
+    if is_call:
+        lower, upper = np.maximum(discounted_spot - discounted_strike, 0.0), discounted_spot
+    else:
+        lower, upper = np.maximum(discounted_strike - discounted_spot, 0.0), discounted_strike
+
+    for quote in (lower - 0.01, upper + 0.01, np.zeros(3), np.full(3, -1.0)):
+        iv = implied_volatility(quote, SPOT, strike, expiry, RATE, is_call, DIVIDEND)
+        assert np.isnan(iv).all()
+
+    inside = 0.5 * (lower + upper)
+    assert np.isfinite(implied_volatility(inside, SPOT, strike, expiry, RATE, is_call, DIVIDEND)).all()
+
+
+def test_expired_or_degenerate_inputs_are_nan():
+    iv = implied_volatility([5.0, 5.0, 5.0], [SPOT, 0.0, SPOT], [100.0, 100.0, 0.0], [0.0, 1.0, 1.0], RATE)
+    assert np.isnan(iv).all()
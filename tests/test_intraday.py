@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from realized_vol.intraday import IntradayVolPipeline, realized_measures
+
+CHUNK_SIZES = [61, 997, 10 ** 7]
+
+
+@pytest.fixture(scope='module')
+def ticks() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    frames = []
+    for ticker, vol in [('AAA', 0.2), ('BBB', 0.4)]:
+        for day in pd.bdate_range('2025-01-02', periods=5):
+            offsets = np.sort(rng.uniform(0, 6.5 * 3600, 400))
+            timestamps = day + pd.Timedelta('9h30min') + pd.to_timedelta(offsets, unit='s')
+            prices = 100 * np.exp(np.cumsum(vol / np.sqrt(252 * 400) * rng.standard_normal(400)))
+            frames.append(pd.DataFrame({'Timestamp': timestamps, 'Ticker': ticker, 'Price': prices}))
+    return pd.concat(frames).sort_values('Timestamp', kind='stable', ignore_index=True)
+
+
+@pytest.fixture(scope='module', params=['csv', 'parquet'])
+def tick_file(request, ticks, tmp_path_factory) -> str:
+    path = str(tmp_path_factory.mktemp('ticks') / f"ticks.{request.param}")
+    if request.param == 'csv':
+        ticks.to_csv(path, index=False)
+    else:
+        ticks.to_parquet(path, index=False)
+    return path
+
+
+def reference_bars(ticks: pd.DataFrame) -> pd.DataFrame:
+    # Whole file in memory: last price per (ticker, 5-minute bucket)
+    bucket = ticks['Timestamp'].dt.floor('5min')
+    bars = ticks.groupby(['Ticker', bucket])['Price'].last().reset_index()
+    return bars.sort_values(['Ticker', 'Timestamp'], ignore_index=True)
+
+
+@pytest.mark.parametrize('chunksize', CHUNK_SIZES)
+def test_bars_match_in_memory_reference(tick_file, ticks, chunksize):
+    bars = pd.concat(IntradayVolPipeline(chunksize=chunksize).iter_bars(tick_file), ignore_index=True)
+    bars = bars.astype({'Timestamp': 'datetime64[ns]'}).sort_values(['Ticker', 'Timestamp'], ignore_index=True)
+    # A bucket that straddles a chunk boundary must come out once, with its last price
+    assert not bars.duplicated(['Ticker', 'Timestamp']).any()
+    pd.testing.assert_frame_equal(bars, reference_bars(ticks), check_dtype=False)
+
+
+@pytest.mark.parametrize('chunksize', CHUNK_SIZES)
+def test_daily_measures_match_in_memory_reference(tick_file, ticks, chunksize):
+    rows = []
+    bars = reference_bars(ticks)
+    for (ticker, day), group in bars.groupby(['Ticker', bars['Timestamp'].dt.normalize()]):
+        prices = group['Price'].to_numpy()
+        rows.append((day, ticker, *realized_measures(prices), len(prices)))
+    expected = pd.DataFrame(rows, columns=['Date', 'Ticker', 'RV', 'BV', 'RK', 'Bars'])
+    expected = expected.set_index(['Date', 'Ticker']).sort_index()
+
+    measures = IntradayVolPipeline(chunksize=chunksize).daily_measures(tick_file)
+    assert list(measures.index) == list(expected.index)
+    np.testing.assert_allclose(measures.to_numpy(dtype=np.float64), expected.to_numpy(dtype=np.float64),
+                               rtol=1e-12, atol=0)
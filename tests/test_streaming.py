@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import synthetic_ohlcv
+from realized_vol.panel_engine import PanelVolEngine, VOL_TYPES
+from realized_vol.streaming import StreamingVolEngine
+
+N_BARS = 160
+
+
+@pytest.fixture(scope='module')
+def prices():
+    df = synthetic_ohlcv(n_tickers=1, n_years=1, seed=11).iloc[:N_BARS]
+    # Mid-series gaps: a whole missing bar and a bar missing only its high/low
+    df.iloc[40:43] = np.nan
+    df.iloc[90, df.columns.get_level_values(0).isin(['High', 'Low'])] = np.nan
+    return df
+
+
+def batch_vols(prices: pd.DataFrame, window: int) -> pd.DataFrame:
+    return PanelVolEngine(prices, window=window).calculate_all_volatility_types().droplevel('Ticker')
+
+
+def assert_same(actual: dict, expected: pd.Series):
+    for vol_type in VOL_TYPES:
+        a, b = actual[vol_type], expected[vol_type]
+        assert a == b or (np.isnan(a) and np.isnan(b)), f"{vol_type}: {a!r} != {b!r}"
+
+
+@pytest.mark.parametrize('window', [5, 21])
+@pytest.mark.parametrize('seed_bars', [1, 21, 60])
+def test_each_update_matches_batch_last_row(prices, window, seed_bars):
+    engine = StreamingVolEngine.from_history(prices.iloc[:seed_bars], window=window)
+    bars = prices.droplevel(1, axis=1)
+    for i in range(seed_bars, N_BARS):
+        latest = engine.update(bars.iloc[i])
+        assert_same(latest, batch_vols(prices.iloc[:i + 1], window).iloc[-1])
+
+
+@pytest.mark.parametrize('window', [5, 21])
+def test_update_batch_matches_batch_history(prices, window):
+    engine = StreamingVolEngine.from_history(prices.iloc[:1], window=window)
+    streamed = engine.update_batch(prices.iloc[1:].droplevel(1, axis=1))
+    expected = batch_vols(prices, window).iloc[1:]
+
+    # The batch back-fills the warm-up and scales Hodges-Tompkins by the full history's
+    # return count, so rows are compared from the first full window on, Hodges-Tompkins at the end
+    warm = slice(window, None)
+    compared = [v for v in VOL_TYPES if v != 'Hodges-Tompkins VOL']
+    np.testing.assert_array_equal(streamed[compared].to_numpy()[warm], expected[compared].to_numpy()[warm])
+    assert_same(engine.latest(), batch_vols(prices, window).iloc[-1])
+
+
+@pytest.mark.parametrize('window', [5, 21])
+def test_from_history_matches_batch_last_row(prices, window):
+    engine = StreamingVolEngine.from_history(prices, window=window)
+    assert_same(engine.latest(), batch_vols(prices, window).iloc[-1])
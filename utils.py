@@ -1,41 +1,87 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from realized_vol.spike_scanner import SpikeScanner
 
-def detect_spikes(vol: pd.Series, threshold: float=2.5) -> List[Dict]:
+def detect_spikes(vol: pd.Series, threshold: float=2.5, lookback: int=252, top: int=10) -> List[Dict]:
     if vol.empty:
         return []
     
-    mean = vol.mean()
-    std = vol.std()
-    spikes = vol[vol > mean + threshold * std]
-
-    if spikes.empty:
+    # Short histories get a shorter baseline so they can still be scanned
+    lookback = min(lookback, max(len(vol) // 2, 2))
+    events = SpikeScanner(lookback=lookback, threshold=threshold).scan(vol.to_frame(), top=top)
+    if events.empty:
         return []
     
-    top_spikes = spikes.sort_values(ascending=False).head(10)
-
-    annotations = []
-    y_positions = set()
-
-    for idx, val  in top_spikes.items():
-        y_pos = val
-        while any(abs(y_pos - existing_y) < (0.1 * vol.max()) for existing_y in y_positions):
-            y_pos *= 0.95
-
-        y_positions.add(y_pos)
-
-        annotations.append(dict(
-            x=idx, 
-            y=y_pos,
-            text = f"Spike: {val:.1f}σ",
+    # Stagger arrow lengths in date order so neighbouring labels do not stack
+    events = events.sort_values('Date', ignore_index=True)
+    offsets = 30 + 25 * (np.arange(len(events)) % 3)
+    
+    return [
+        dict(
+            x=row.Date,
+            y=row.Vol,
+            text=f"Spike: {row.ZScore:.1f}σ",
             showarrow=True,
             arrowhead=1,
             ax=0,
-            ay=30,
+            ay=int(offset),
             bgcolor='rgba(255, 255, 255, 0.8)',
             bordercolor='rgba(0,0,0,0.5)',
             borderwidth=1,
             font=dict(size=12, color='black')
-        ))
+        )
+        for row, offset in zip(events.itertuples(index=False), offsets)
+    ]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets, approximated in two vectorised passes: keeps the first and
+    # last point and, from each bucket in between, the point forming the largest triangle with the
+    # next bucket's mean and an anchor standing in for the previous pick (see pick below)
+    n = len(x)
+    if n_out < 3 or n <= n_out:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    # n > n_out puts the edges more than one point apart, so no bucket is empty
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    offsets, lengths = edges[:-1] - 1, np.diff(edges)
+    inner_x, inner_y = x[1:-1], y[1:-1]
+    bucket = np.repeat(np.arange(n_out - 2), lengths)
+
+    mean_x = np.add.reduceat(inner_x, offsets) / lengths
+    mean_y = np.add.reduceat(inner_y, offsets) / lengths
+    next_x = np.repeat(np.append(mean_x[1:], x[-1]), lengths)
+    next_y = np.repeat(np.append(mean_y[1:], y[-1]), lengths)
+
+    def pick(anchor_x, anchor_y):
+        anchor_x, anchor_y = np.repeat(anchor_x, lengths), np.repeat(anchor_y, lengths)
+        area = np.abs((anchor_x - next_x) * (inner_y - anchor_y) - (anchor_x - inner_x) * (next_y - anchor_y))
+        hits = np.flatnonzero(area == np.repeat(np.maximum.reduceat(area, offsets), lengths))
+        first = np.ones(len(hits), dtype=bool)
+        first[1:] = bucket[hits[1:]] != bucket[hits[:-1]]
+        return hits[first] + 1
+
+    # All buckets are solved at once, so the previous pick is not known up front: a first pass
+    # anchors on the previous bucket's mean, a second on the previous bucket's first-pass pick
+    picks = pick(np.append(x[0], mean_x[:-1]), np.append(y[0], mean_y[:-1]))
+    picks = pick(np.append(x[0], x[picks[:-1]]), np.append(y[0], y[picks[:-1]]))
+    return np.concatenate(([0], picks, [n - 1]))
+
+
+def downsample_indices(index: pd.Index, y: np.ndarray, n_out: int, x_range: Tuple = None) -> np.ndarray:
+    # Dense LTTB inside the visible range plus a coarse pass over the full history,
+    # so the range slider still shows everything after zooming in
+    x = np.asarray(index.to_numpy(dtype='datetime64[ns]').astype(np.int64), dtype=np.float64)
+    if x_range is None:
+        return lttb_indices(x, y, n_out)
 
-        return annotations
\ No newline at end of file
+    lo, hi = (pd.Timestamp(bound).value for bound in x_range)
+    visible = np.flatnonzero((x >= lo) & (x <= hi))
+    overview = lttb_indices(x, y, max(n_out // 4, 3))
+    if len(visible) == 0:
+        return overview
+    detail = visible[lttb_indices(x[visible], y[visible], n_out)]
+    return np.union1d(overview, detail)